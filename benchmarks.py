@@ -0,0 +1,164 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmarks
+
+Small timing and memory scripts for the save system. Run from the project folder:
+
+python benchmarks.py
+"""
+
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import character_manager
+
+# ============================================================================
+# SAVE THROUGHPUT
+# ============================================================================
+
+def benchmark_save_modes(saves=400, threads=16, modes=("none", "always", "group")):
+    """
+    Measure saves per second for each save_character sync mode
+
+    Each mode saves `saves` characters from `threads` threads into a fresh
+    temp directory.
+
+    Returns: Dictionary {mode: saves per second}
+    """
+    results = {}
+    characters = [
+        character_manager.create_character(f"Bench{i}", "Warrior") for i in range(saves)
+    ]
+
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as save_directory:
+            def save(character):
+                character_manager.save_character(character, save_directory, sync=mode)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(save, characters))
+            elapsed = time.perf_counter() - start
+            results[mode] = saves / elapsed
+    return results
+
+def save_many(save_directory, prefix, saves):
+    """Worker process for benchmark_process_saves"""
+    for i in range(saves):
+        character = character_manager.create_character(f"{prefix}-{i % 50}", "Rogue")
+        character_manager.save_character(character, save_directory)
+
+def benchmark_process_saves(saves_per_process=300, process_counts=(1, 4, 16)):
+    """
+    Measure locked save throughput from several processes at once
+    
+    Every process saves into the same directory (so they share its lock
+    file) but to its own characters.
+    
+    Returns: Dictionary {process count: saves per second}
+    """
+    results = {}
+    context = multiprocessing.get_context()
+    for count in process_counts:
+        with tempfile.TemporaryDirectory() as save_directory:
+            workers = [
+                context.Process(target=save_many, args=(save_directory, f"P{n}", saves_per_process))
+                for n in range(count)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            results[count] = count * saves_per_process / elapsed
+    return results
+
+# ============================================================================
+# CHARACTER MEMORY
+# ============================================================================
+
+def benchmark_character_memory(count=100000, items=("health_potion", "iron_sword")):
+    """
+    Measure bytes per character for plain dicts and Character records
+    
+    Each representation is measured twice: freshly built, and after its
+    inventory has been used (items appended), since Character only
+    builds its lists on first use.
+    
+    Returns: Dictionary {label: bytes per character}
+    """
+    template = dict(character_manager.create_character("Bench", "Warrior"))
+    builders = {
+        "dict": lambda: {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in template.items()
+        },
+        "Character": lambda: character_manager.Character(template),
+    }
+
+    results = {}
+    for label, build in builders.items():
+        for used in (False, True):
+            tracemalloc.start()
+            characters = [build() for i in range(count)]
+            if used:
+                for character in characters:
+                    character["inventory"].extend(items)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del characters
+            results[f"{label} ({'used' if used else 'fresh'})"] = size / count
+    return results
+
+# ============================================================================
+# PROGRESSION EVENTS
+# ============================================================================
+
+def benchmark_progression_events(awards=100000):
+    """
+    Measure gain_experience calls per second with and without event handlers
+    
+    Returns: Dictionary {label: awards per second}
+    """
+    sinks = {
+        "no subscribers": None,
+        "NullSink": character_manager.NullSink(),
+        "BufferedLogSink": character_manager.BufferedLogSink(),
+    }
+    results = {}
+    for label, sink in sinks.items():
+        if sink is not None:
+            character_manager.EVENTS.subscribe(sink)
+        character = character_manager.create_character("Bench", "Warrior")
+        start = time.perf_counter()
+        for i in range(awards):
+            character_manager.gain_experience(character, 150)
+        results[label] = awards / (time.perf_counter() - start)
+        if sink is not None:
+            character_manager.EVENTS.unsubscribe(sink)
+    return results
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SAVE THROUGHPUT ===")
+    for mode, rate in benchmark_save_modes().items():
+        print(f"sync={mode:<7} {rate:10.0f} saves/sec")
+
+    print("\n=== LOCKED SAVES ACROSS PROCESSES ===")
+    for count, rate in benchmark_process_saves().items():
+        print(f"{count:>2} processes {rate:10.0f} saves/sec")
+
+    print("\n=== PROGRESSION EVENTS ===")
+    for label, rate in benchmark_progression_events().items():
+        print(f"{label:<16} {rate:10.0f} awards/sec")
+
+    print("\n=== CHARACTER MEMORY ===")
+    for label, size in benchmark_character_memory().items():
+        print(f"{label:<18} {size:8.0f} bytes/character")
@@ -10,14 +10,36 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import hashlib
+import json
+import operator
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import compress, repeat
+from math import isqrt
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError
+    CharacterDeadError,
+    SaveConflictError
 )
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows; saves are then unlocked
+    fcntl = None
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -84,16 +106,36 @@ def create_character(name, character_class):
         "completed_quests": []
     }
     
-    return character
+    # Compact and tracked, so saves can tell what changed (all fields start dirty)
+    return Character(character)
     
     pass
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", sync="none"):
     """
     Save character to file
     
     Filename format: {character_name}_save.txt
     
+    The file is written to a temp file and renamed over the old save, so
+    a crash leaves either the old or the new save, never a partial one.
+    
+    Saving a tracked character (Character/TrackedCharacter) that hasn't
+    changed since it was loaded from or last saved to this same file (and
+    the file still exists) writes nothing.
+    
+    Each save stamps VERSION (previous + 1) into the file and into
+    character["version"]. A character that carries a version (it was
+    loaded or saved before) is only written if the file still has that
+    version; otherwise SaveConflictError is raised. Characters without
+    a version (new ones) overwrite whatever is there.
+    
+    sync controls durability:
+    - "none": no fsync (fastest; a power cut may lose the latest saves)
+    - "always": fsync every save before returning
+    - "group": like "always", but saves issued within a few milliseconds
+      of each other share one directory flush (see GroupCommitter)
+    
     File format:
     NAME: character_name
     CLASS: class_name
@@ -109,7 +151,7 @@ def save_character(character, save_directory="data/save_games"):
     COMPLETED_QUESTS: quest1,quest2
     
     Returns: True if successful
-    Raises: PermissionError, IOError (let them propagate or handle)
+    Raises: SaveConflictError, PermissionError, IOError
     """
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
@@ -118,17 +160,55 @@ def save_character(character, save_directory="data/save_games"):
     # Ensure directory exists
      # Build file path
     # Ensure directory exists
-    os.makedirs(save_directory, exist_ok=True)
-    filename = f"{character['name']}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    filepath = get_save_path(character["name"], save_directory)
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    
+    # A tracked character with no changes since its last save is skipped
+    if is_saved_to(character, filepath) and os.path.isfile(filepath):
+        return True
+    expected_version = read_field(character, "version")
+    save_text = format_save_text(character)
+    
+    # Write to file while holding the character's lock, checking that
+    # nobody saved over the version this character was loaded from
+    with save_lock(character["name"], save_directory):
+        saved_version = current_save_version(character["name"], save_directory)
+        if expected_version is not None and saved_version not in (None, expected_version):
+            raise SaveConflictError(
+                f"'{character['name']}' was saved elsewhere (version {saved_version}, "
+                f"expected {expected_version}). Reload before saving."
+            )
+        version = (saved_version or 0) + 1
+        write_file_atomically(filepath, save_text + format_version_line(version), sync)
+        # The new save holds every field, so a journal left by
+        # JournalSaveStore would only replay older values over it
+        try:
+            os.remove(get_journal_path(character["name"], save_directory))
+        except FileNotFoundError:
+            pass
+    character["version"] = version
+    record_saved_character(character["name"], save_directory)
+    if is_tracked(character):
+        character.saved_path = os.path.abspath(filepath)
+        character.mark_clean()
+    
+    return True
+    pass
+
+def format_save_text(character):
+    """
+    Build the text of a save file for a character
     
+    Returns: String in the save file format described in save_character
+             (without the VERSION line, which save_character adds)
+    """
     # Convert lists → comma-separated strings
-    inventory_str = ",".join(character.get("inventory", []))
-    active_q_str = ",".join(character.get("active_quests", []))
-    completed_q_str = ",".join(character.get("completed_quests", []))
+    inventory_str = ",".join(read_field(character, "inventory", []))
+    active_q_str = ",".join(read_field(character, "active_quests", []))
+    completed_q_str = ",".join(read_field(character, "completed_quests", []))
     
     # Build text content
-    save_text = (
+    return (
         f"NAME: {character['name']}\n"
         f"CLASS: {character['class']}\n"
         f"LEVEL: {character['level']}\n"
@@ -142,13 +222,10 @@ def save_character(character, save_directory="data/save_games"):
         f"ACTIVE_QUESTS: {active_q_str}\n"
         f"COMPLETED_QUESTS: {completed_q_str}\n"
     )
-    
-    # Write to file
-    with open(filepath, "w", encoding="utf-8") as save_file:
-        save_file.write(save_text)
-    
-    return True
-    pass
+
+def format_version_line(version):
+    """Save-file line for a version stamp ("" if there isn't one)"""
+    return "" if version is None else f"VERSION: {version}\n"
 
 def load_character(character_name, save_directory="data/save_games"):
     """
@@ -169,68 +246,61 @@ def load_character(character_name, save_directory="data/save_games"):
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
     
-    filepath = os.path.join(save_directory, f"{character_name}_save.txt")
+    filepath = get_save_path(character_name, save_directory)
 
-    # --- Check if save file exists ---
-    if not os.path.isfile(filepath):
-        raise CharacterNotFoundError(f"No save file found for '{character_name}'.")
+    # --- Read the save and its journal together (under a shared lock) ---
+    try:
+        with save_lock(character_name, save_directory, exclusive=False):
+            character = read_save_files(character_name, save_directory)
+    except OSError as e:
+        raise SaveFileCorruptedError(f"Could not read save file: {e}")
+    character = track_character(character)
+    character.saved_path = os.path.abspath(filepath)
+    return character
+    pass
 
+def read_save_files(character_name, save_directory="data/save_games"):
+    """
+    Read a character's save file and replay its journal, without locking
+    
+    Callers hold save_lock (see load_character).
+    
+    Returns: Character dictionary (not tracked)
+    Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+    """
+    # --- Read the whole file at once ---
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        with open(get_save_path(character_name, save_directory), "rb") as f:
+            data = f.read()
+    except (FileNotFoundError, IsADirectoryError):
+        raise CharacterNotFoundError(f"No save file found for '{character_name}'.")
     except Exception as e:
         raise SaveFileCorruptedError(f"Could not read save file: {e}")
 
-    # --- Parse file ---
-    character = {}
-
-    expected_fields = {
-        "NAME", "CLASS", "LEVEL", "HEALTH", "MAX_HEALTH",
-        "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD",
-        "INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"
-    }
-
-    for line in lines:
-        if ":" not in line:
-            raise InvalidSaveDataError("Malformed line in save file.")
-
-        key, value = line.strip().split(":", 1)
-        key = key.strip().upper()
-        value = value.strip()
-
-        # Validate field name
-        if key not in expected_fields:
-            raise InvalidSaveDataError(f"Unexpected field: {key}")
+    # --- Parse and validate in one pass (see parse_save_bytes) ---
+    character = parse_save_bytes(data)
+    # Saves from before version stamps count as version 0 (see read_save_version),
+    # so they are still checked for conflicts when saved again
+    character.setdefault("version", 0)
 
-        # Convert numerical fields
-        if key in {"LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"}:
-            if not value.isdigit():
-                raise InvalidSaveDataError(f"Invalid value for {key}: {value}")
-            character[key.lower()] = int(value)
-
-        # Convert list fields
-        elif key in {"INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"}:
-            if value == "":
-                character[key.lower()] = []
-            else:
-                character[key.lower()] = value.split(",")
-
-        # Normal string fields
-        else:
-            character[key.lower()] = value
-
-    # --- Final validation ---
-    missing = expected_fields - {k.upper() for k in character.keys()}
-    if missing:
-        raise InvalidSaveDataError(f"Missing fields: {missing}")
+    # --- Apply changes saved after the snapshot (journal backend) ---
+    apply_journal(character, get_journal_path(character_name, save_directory))
     return character
-    pass
 
-def list_saved_characters(save_directory="data/save_games"):
+def list_saved_characters(save_directory="data/save_games", offset=0, limit=None):
     """
     Get list of all saved character names
     
-    Returns: List of character names (without _save.txt extension)
+    Sharded directories are listed from their name index; flat ones are
+    scanned.
+    
+    Args:
+        save_directory: Directory containing save files
+        offset: Number of names to skip (for paging)
+        limit: Most names to return (None = all)
+    
+    Returns: List of character names (without _save.txt extension),
+             in alphabetical order
     """
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
@@ -238,6 +308,8 @@ def list_saved_characters(save_directory="data/save_games"):
     
     if not os.path.isdir(save_directory):
         return []
+    if is_sharded(save_directory):
+        return get_save_index(save_directory).page(offset, limit)
 
     characters = []
 
@@ -245,7 +317,9 @@ def list_saved_characters(save_directory="data/save_games"):
         if filename.endswith("_save.txt"):
             characters.append(filename.replace("_save.txt", ""))
 
-    return characters
+    characters.sort()
+    stop = None if limit is None else offset + limit
+    return characters[offset:stop]
     pass
 
 def delete_character(character_name, save_directory="data/save_games"):
@@ -257,169 +331,2394 @@ def delete_character(character_name, save_directory="data/save_games"):
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
-    filepath = os.path.join(save_directory, f"{character_name}_save.txt")
+    filepath = get_save_path(character_name, save_directory)
 
     # Check if save exists
     if not os.path.isfile(filepath):
         raise CharacterNotFoundError(f"No save file found for '{character_name}'.")
 
-    # Delete file
+    # Delete file (and any journal written by JournalSaveStore)
     os.remove(filepath)
+    journal_path = get_journal_path(character_name, save_directory)
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+    if is_sharded(save_directory):
+        get_save_index(save_directory).remove(character_name)
+    invalidate_cached_character(character_name, save_directory)
     return True
     pass
 
+def get_save_path(character_name, save_directory="data/save_games"):
+    """
+    Get the path of a character's save file
+    
+    Returns: Path like save_directory/{character_name}_save.txt, or
+             save_directory/<shard>/{character_name}_save.txt if the
+             directory uses the sharded layout (see migrate_to_sharded)
+    """
+    filename = f"{character_name}_save.txt"
+    if is_sharded(save_directory):
+        return os.path.join(save_directory, shard_for(character_name), filename)
+    return os.path.join(save_directory, filename)
+
+def get_journal_path(character_name, save_directory="data/save_games"):
+    """
+    Get the path of a character's change journal (see JournalSaveStore)
+    
+    Returns: The save file path with .journal instead of .txt
+    """
+    return get_save_path(character_name, save_directory)[:-len(".txt")] + ".journal"
+
 # ============================================================================
-# CHARACTER OPERATIONS
+# SHARDED SAVE LAYOUT
 # ============================================================================
 
-def gain_experience(character, xp_amount):
+# Present in a save directory that uses the sharded layout
+SHARDED_LAYOUT_FILE = ".sharded"
+# Name index kept in sharded save directories (see SaveIndex)
+SAVE_INDEX_FILE = "names.index"
+
+def is_sharded(save_directory):
+    """True if save_directory has been migrated to the sharded layout"""
+    return os.path.isfile(os.path.join(save_directory, SHARDED_LAYOUT_FILE))
+
+def shard_for(character_name):
     """
-    Add experience to character and handle level ups
-    
-    Level up formula: level_up_xp = current_level * 100
-    Example when leveling up:
-    - Increase level by 1
-    - Increase max_health by 10
-    - Increase strength by 2
-    - Increase magic by 2
-    - Restore health to max_health
+    Get the subdirectory a character's files live in (sharded layout)
     
-    Raises: CharacterDeadError if character health is 0
+    Returns: First two hex digits of the name's SHA-1 (256 shards)
     """
-    # TODO: Implement experience gain and leveling
-    # Check if character is dead first
-    # Add experience
-    # Check for level up (can level up multiple times)
-    # Update stats on level up
-     # Cannot gain XP if dead
+    return hashlib.sha1(character_name.encode("utf-8")).hexdigest()[:2]
+
+class SaveIndex:
+    """
+    On-disk list of the characters saved in a sharded directory
     
-    if character["health"] <= 0:
-        raise CharacterDeadError("Character is dead and cannot gain experience.")
+    The file is append-only: "+name" when a character is first saved,
+    "-name" when it is deleted. The names are kept in memory and the
+    file is only re-read if another process changed it. When deletions
+    outnumber the names still saved, the file is rewritten without them.
+    Listing and existence checks use the index instead of scanning the
+    shard directories.
+    
+    Changes hold self.lock (threads) and save_index_lock (processes), so
+    an append from one process can't be lost to a rewrite in another.
+    """
+    def __init__(self, save_directory):
+        """
+        Args:
+            save_directory: Sharded save directory holding the index file
+        """
+        self.save_directory = save_directory
+        self.path = os.path.join(save_directory, SAVE_INDEX_FILE)
+        self.lock = threading.Lock()
+        self.names = set()
+        self.sorted_names = []
+        self.removals = 0
+        self.stamp = None
 
-    # Add XP
-    character["experience"] += xp_amount
-    print(f"\n+{xp_amount} XP gained!")
+    def refresh(self):
+        """Re-read the index file if it changed since we last saw it (lock held)"""
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            info = None
+        stamp = info and (info.st_size, info.st_mtime_ns)
+        if stamp == self.stamp:
+            return
 
-    # Check for level-ups (may happen multiple times)
-    leveled_up = False
+        names = set()
+        removals = 0
+        if info is not None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # torn final write
+                    if line.startswith("+"):
+                        names.add(line[1:-1])
+                    elif line.startswith("-"):
+                        names.discard(line[1:-1])
+                        removals += 1
+        self.names = names
+        self.sorted_names = None
+        self.removals = removals
+        self.stamp = stamp
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        leveled_up = True
+    def append(self, line):
+        """Append one entry and remember the file's new size (locks held)"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        info = os.stat(self.path)
+        self.stamp = (info.st_size, info.st_mtime_ns)
+        self.sorted_names = None
 
-        # Stat increases
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
+    def add(self, character_name):
+        """Record that a character is saved (no-op if already listed)"""
+        with self.lock, save_index_lock(self.save_directory):
+            self.refresh()
+            if character_name not in self.names:
+                self.append("+" + character_name)
+                self.names.add(character_name)
 
-        # Heal to full on level up
-        character["health"] = character["max_health"]
+    def remove(self, character_name):
+        """Record that a character was deleted"""
+        with self.lock, save_index_lock(self.save_directory):
+            self.refresh()
+            if character_name in self.names:
+                self.append("-" + character_name)
+                self.names.discard(character_name)
+                self.removals += 1
+                if self.removals > len(self.names):
+                    self.rewrite(self.names)
 
-        print(f"\n🎉 LEVEL UP! You are now level {character['level']}!")
-        print(f"+10 Max Health, +2 Strength, +2 Magic")
+    def rewrite(self, names):
+        """Replace the whole index with names (locks held)"""
+        write_file_atomically(self.path, "".join(f"+{name}\n" for name in sorted(names)))
+        self.stamp = None
+        self.refresh()
 
-    return leveled_up
-    pass
+    def contains(self, character_name):
+        """True if the character is listed"""
+        with self.lock:
+            self.refresh()
+            return character_name in self.names
 
-def add_gold(character, amount):
+    def count(self):
+        """Number of characters listed"""
+        with self.lock:
+            self.refresh()
+            return len(self.names)
+
+    def page(self, offset=0, limit=None):
+        """
+        Get names in alphabetical order
+        
+        Returns: List of up to limit names starting at offset
+        """
+        with self.lock:
+            self.refresh()
+            if self.sorted_names is None:
+                self.sorted_names = sorted(self.names)
+            stop = None if limit is None else offset + limit
+            return self.sorted_names[offset:stop]
+
+SAVE_INDEXES = {}
+SAVE_INDEXES_LOCK = threading.Lock()
+
+def get_save_index(save_directory):
+    """Get the shared SaveIndex for a sharded save directory"""
+    key = os.path.abspath(save_directory)
+    with SAVE_INDEXES_LOCK:
+        if key not in SAVE_INDEXES:
+            SAVE_INDEXES[key] = SaveIndex(save_directory)
+        return SAVE_INDEXES[key]
+
+def save_exists(character_name, save_directory="data/save_games"):
     """
-    Add gold to character's inventory
+    Check whether a character has a save (uses the index when sharded)
+    """
+    if is_sharded(save_directory):
+        return get_save_index(save_directory).contains(character_name)
+    return os.path.isfile(get_save_path(character_name, save_directory))
+
+def count_saved_characters(save_directory="data/save_games"):
+    """Get the number of saved characters (uses the index when sharded)"""
+    if is_sharded(save_directory):
+        return get_save_index(save_directory).count()
+    return len(list_saved_characters(save_directory))
+
+def record_saved_character(character_name, save_directory):
+    """Add a freshly written save to the name index (sharded layout only)"""
+    if is_sharded(save_directory):
+        get_save_index(save_directory).add(character_name)
+
+def migrate_to_sharded(save_directory="data/save_games"):
+    """
+    Move a flat save directory to the sharded layout
     
-    Args:
-        character: Character dictionary
-        amount: Amount of gold to add (can be negative for spending)
+    Save files and journals move into save_directory/<shard>/, the name
+    index is built, and the layout marker is written last. Safe to run
+    again after an interruption; already-sharded directories just get
+    their index rebuilt.
     
-    Returns: New gold total
-    Raises: ValueError if result would be negative
+    Returns: Number of save files moved
     """
-    # TODO: Implement gold management
-    # Check that result won't be negative
-    # Update character's gold
-      # Ensure character has a gold field
+    os.makedirs(save_directory, exist_ok=True)
+    moved = 0
+    for filename in os.listdir(save_directory):
+        for suffix in ("_save.txt", "_save.journal"):
+            if filename.endswith(suffix):
+                name = filename[:-len(suffix)]
+                shard_directory = os.path.join(save_directory, shard_for(name))
+                os.makedirs(shard_directory, exist_ok=True)
+                os.replace(
+                    os.path.join(save_directory, filename),
+                    os.path.join(shard_directory, filename),
+                )
+                moved += suffix == "_save.txt"
+
+    rebuild_save_index(save_directory)
+    with open(os.path.join(save_directory, SHARDED_LAYOUT_FILE), "w", encoding="utf-8") as f:
+        f.write("sharded: sha1 prefix, 2 hex digits\n")
+    return moved
+
+def rebuild_save_index(save_directory="data/save_games"):
+    """
+    Rebuild the name index by scanning the shard directories once
     
-    if "gold" not in character:
-        raise KeyError("Character dictionary must contain a 'gold' field.")
+    Returns: Number of characters found
+    """
+    names = []
+    for shard in os.listdir(save_directory):
+        shard_directory = os.path.join(save_directory, shard)
+        if len(shard) != 2 or not os.path.isdir(shard_directory):
+            continue
+        for filename in os.listdir(shard_directory):
+            if filename.endswith("_save.txt"):
+                names.append(filename[:-len("_save.txt")])
 
-    new_gold = character["gold"] + amount
+    index = get_save_index(save_directory)
+    with index.lock, save_index_lock(save_directory):
+        index.rewrite(names)
+    return len(names)
 
-    # Prevent negative gold
-    if new_gold < 0:
-        raise ValueError(
-            f"Cannot remove {abs(amount)} gold — result would be negative."
-        )
+# ============================================================================
+# TRACKED CHARACTERS
+# ============================================================================
 
-    # Update gold
-    character["gold"] = new_gold
-    return new_gold
-    pass
+# Fields stored in a save (and allowed in journal entries), with their types
+SAVE_FIELD_TYPES = {
+    "name": str, "class": str, "level": int, "health": int, "max_health": int,
+    "strength": int, "magic": int, "experience": int, "gold": int,
+    "inventory": list, "active_quests": list, "completed_quests": list
+}
+# Fields a save may also have (written by save_character, see SAVE LOCKING)
+SAVE_OPTIONAL_FIELDS = {"version": int}
 
-def heal_character(character, amount):
+class TrackedCharacter(dict):
     """
-    Heal character by specified amount
+    A character dictionary that remembers which fields changed
     
-    Health cannot exceed max_health
+    Works anywhere a plain character dict does. Setting a field to a new
+    value (or changing one of its lists in place) adds the field to
+    dirty_fields() until mark_clean() is called. Save backends use this
+    to write only the changed fields and to skip saves that would change
+    nothing.
     
-    Returns: Actual amount healed
-    """
-    # TODO: Implement healing
-    # Calculate actual healing (don't exceed max_health)
-    # Update character health
+    Lists stored in the character are wrapped in TrackedList so that
+    character['inventory'].append(...) is noticed. A list kept from before
+    it was assigned is a separate copy and is not tracked.
     
-    if amount < 0:
-        raise ValueError("Healing amount cannot be negative.")
+    saved_path is the save file or database it was last loaded from or
+    saved to (None if it has never been).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.dirty = set()
+        self.saved_path = None
+        self.update(*args, **kwargs)
 
-    current_hp = character.get("health")
-    max_hp = character.get("max_health")
+    def __setitem__(self, field, value):
+        if field in self:
+            old = dict.__getitem__(self, field)
+            if old == value and (type(old) is type(value) or isinstance(value, list)):
+                return  # no real change
+        if isinstance(value, list):
+            value = TrackedList(value, self, field)
+        dict.__setitem__(self, field, value)
+        self.dirty.add(field)
 
-    if current_hp is None or max_hp is None:
-        raise KeyError("Character must have 'health' and 'max_health' fields.")
+    def __delitem__(self, field):
+        dict.__delitem__(self, field)
+        self.dirty.add(field)
 
-    # Calculate heal without exceeding max health
-    heal_amount = min(amount, max_hp - current_hp)
+    def __reduce__(self):
+        # Pickle/deepcopy as plain data so the lists don't point back here
+        return (restore_tracked_character, (dict(self), sorted(self.dirty)))
 
-    # Apply healing
-    character["health"] = current_hp + heal_amount
+    def update(self, *args, **kwargs):
+        for field, value in dict(*args, **kwargs).items():
+            self[field] = value
 
-    return heal_amount
-    pass
+    def setdefault(self, field, default=None):
+        if field not in self:
+            self[field] = default
+        return dict.__getitem__(self, field)
 
-def is_character_dead(character):
+    def pop(self, field, *default):
+        if field in self:
+            self.dirty.add(field)
+        return dict.pop(self, field, *default)
+
+    def popitem(self):
+        field, value = dict.popitem(self)
+        self.dirty.add(field)
+        return field, value
+
+    def clear(self):
+        self.dirty.update(self)
+        dict.clear(self)
+
+    def dirty_fields(self):
+        """Get the fields changed since the last mark_clean()"""
+        return frozenset(self.dirty)
+
+    def is_dirty(self):
+        """True if anything changed since the last mark_clean()"""
+        return bool(self.dirty)
+
+    def mark_dirty(self, field):
+        """Flag a field as changed (e.g. after editing a nested value)"""
+        self.dirty.add(field)
+
+    def mark_clean(self):
+        """Forget recorded changes (call after the character is saved)"""
+        self.dirty.clear()
+
+class TrackedList(list):
     """
-    Check if character's health is 0 or below
+    List stored in a TrackedCharacter or Character; changes mark its field dirty
+    """
+    __slots__ = ("owner", "field")
+
+    def __init__(self, values, owner, field):
+        super().__init__(values)
+        self.owner = owner
+        self.field = field
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def changed(self):
+        self.owner.mark_dirty(self.field)
+
+def tracked_list_method(name):
+    """Build a TrackedList method that calls list's version, then changed()"""
+    method = getattr(list, name)
+
+    def tracked(self, *args):
+        result = method(self, *args)
+        self.changed()
+        return self if name in ("__iadd__", "__imul__") else result
+
+    tracked.__name__ = name
+    return tracked
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(TrackedList, _name, tracked_list_method(_name))
+del _name
+
+def restore_tracked_character(fields, dirty):
+    """Rebuild a pickled/copied TrackedCharacter"""
+    character = TrackedCharacter(fields)
+    character.dirty = set(dirty)
+    return character
+
+def track_character(character):
+    """
+    Turn a character dict into a Character with no changes recorded
     
-    Returns: True if dead, False if alive
+    Used for characters that were just loaded, so they match their save.
     """
-    # TODO: Implement death check
+    return Character.from_saved_fields(character)
+
+def is_tracked(character):
+    """True if character records its dirty fields"""
+    return isinstance(character, (TrackedCharacter, Character))
+
+def is_unchanged(character):
+    """True if character is tracked and nothing changed since its last save"""
+    return is_tracked(character) and not character.is_dirty()
+
+def is_saved_to(character, filepath):
+    """True if character is unchanged since it was loaded from or saved to filepath"""
+    return is_unchanged(character) and character.saved_path == os.path.abspath(filepath)
+
+# ============================================================================
+# COMPACT CHARACTERS
+# ============================================================================
+
+# Slot that holds each saved field ("class" is a keyword, so it is renamed)
+CHARACTER_SLOTS = {
+    field: "character_class" if field == "class" else field
+    for field in (*SAVE_FIELD_TYPES, *SAVE_OPTIONAL_FIELDS)
+}
+CHARACTER_FIELD_BITS = {field: 1 << i for i, field in enumerate(CHARACTER_SLOTS)}
+CHARACTER_LIST_FIELDS = frozenset(
+    field for field, field_type in SAVE_FIELD_TYPES.items() if field_type is list
+)
+UNSET = object()
+
+class Character(MutableMapping):
+    """
+    Memory-light character record that still works like a dictionary
     
-    if "health" not in character:
-        raise KeyError("Character dictionary must contain a 'health' field.")
+    character["gold"], .get(), "in", iteration, == against dicts and the
+    rest of the dict API behave as they do for the dictionaries the other
+    modules expect. The twelve saved fields live in __slots__, keys
+    outside them (equipped_weapon, ...) go in a small `extra` dict, and
+    list fields are kept as tuples until someone reads them. This makes a
+    character less than half the size of the same data in a dict.
     
-    return character["health"] <= 0
-    pass
+    Changes are tracked like TrackedCharacter (dirty_fields, mark_clean),
+    as a bitmask of saved fields plus a set for changed extra keys, and
+    saved_path is the save file or database it was last loaded from or
+    saved to.
+    """
+    __slots__ = tuple(CHARACTER_SLOTS.values()) + ("extra", "dirty", "dirty_extra", "saved_path")
 
-def revive_character(character):
+    def __init__(self, fields=(), **kwargs):
+        self.extra = None
+        self.dirty = 0
+        self.dirty_extra = None
+        self.saved_path = None
+        self.update(fields, **kwargs)
+
+    def __getitem__(self, field):
+        slot = CHARACTER_SLOTS.get(field)
+        if slot is None:
+            if self.extra is None:
+                raise KeyError(field)
+            return self.extra[field]
+
+        value = getattr(self, slot, UNSET)
+        if value is UNSET:
+            raise KeyError(field)
+        if type(value) is tuple and field in CHARACTER_LIST_FIELDS:
+            # First read of a stored list: hand out a tracked list from now on
+            value = TrackedList(value, self, field)
+            setattr(self, slot, value)
+        return value
+
+    def __setitem__(self, field, value):
+        old = self.peek(field, UNSET)
+        if old is not UNSET and same_field_value(old, value):
+            return  # no real change
+
+        slot = CHARACTER_SLOTS.get(field)
+        if slot is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+        else:
+            if field in CHARACTER_LIST_FIELDS and isinstance(value, (list, tuple)):
+                value = tuple(value)
+            setattr(self, slot, value)
+        self.mark_dirty(field)
+
+    def __delitem__(self, field):
+        slot = CHARACTER_SLOTS.get(field)
+        if slot is None:
+            if self.extra is None:
+                raise KeyError(field)
+            del self.extra[field]
+        elif getattr(self, slot, UNSET) is UNSET:
+            raise KeyError(field)
+        else:
+            delattr(self, slot)
+        self.mark_dirty(field)
+
+    def __contains__(self, field):
+        return self.peek(field, UNSET) is not UNSET
+
+    def __iter__(self):
+        for field, slot in CHARACTER_SLOTS.items():
+            if getattr(self, slot, UNSET) is not UNSET:
+                yield field
+        if self.extra:
+            yield from list(self.extra)
+
+    def __len__(self):
+        return sum(1 for field in self)
+
+    def __repr__(self):
+        return f"Character({dict(self)!r})"
+
+    def __reduce__(self):
+        # Pickle/deepcopy as plain data so the lists don't point back here
+        return (restore_character, (dict(self), sorted(self.dirty_fields())))
+
+    @classmethod
+    def from_saved_fields(cls, fields):
+        """
+        Build a clean Character from a dict of fields, skipping per-field checks
+        
+        For data that already matches its save (e.g. a just-parsed file).
+        """
+        character = cls.__new__(cls)
+        character.extra = None
+        character.dirty = 0
+        character.dirty_extra = None
+        character.saved_path = None
+        for field, value in fields.items():
+            slot = CHARACTER_SLOTS.get(field)
+            if slot is None:
+                if character.extra is None:
+                    character.extra = {}
+                character.extra[field] = value
+            else:
+                if field in CHARACTER_LIST_FIELDS and isinstance(value, list):
+                    value = tuple(value)
+                setattr(character, slot, value)
+        return character
+
+    def peek(self, field, default=None):
+        """
+        Get a field without converting a stored tuple into a list
+        
+        For read-only uses like building a save file.
+        """
+        slot = CHARACTER_SLOTS.get(field)
+        if slot is None:
+            return default if self.extra is None else self.extra.get(field, default)
+        value = getattr(self, slot, UNSET)
+        return default if value is UNSET else value
+
+    def copy(self):
+        """Shallow copy (lists are copied, like the dicts from load_character)"""
+        return Character(
+            (field, list(value) if isinstance(value, (list, tuple)) else value)
+            for field, value in ((field, self.peek(field)) for field in self)
+        )
+
+    def dirty_fields(self):
+        """Get the fields changed since the last mark_clean()"""
+        fields = {field for field, bit in CHARACTER_FIELD_BITS.items() if self.dirty & bit}
+        return frozenset(fields.union(self.dirty_extra or ()))
+
+    def is_dirty(self):
+        """True if anything changed since the last mark_clean()"""
+        return bool(self.dirty or self.dirty_extra)
+
+    def mark_dirty(self, field):
+        """Flag a field as changed (e.g. after editing a nested value)"""
+        bit = CHARACTER_FIELD_BITS.get(field)
+        if bit is not None:
+            self.dirty |= bit
+        elif self.dirty_extra is None:
+            self.dirty_extra = {field}
+        else:
+            self.dirty_extra.add(field)
+
+    def mark_clean(self):
+        """Forget recorded changes (call after the character is saved)"""
+        self.dirty = 0
+        self.dirty_extra = None
+
+def same_field_value(old, new):
+    """True if assigning new over old wouldn't change the character"""
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        return len(old) == len(new) and all(a == b for a, b in zip(old, new))
+    return type(old) is type(new) and old == new
+
+def restore_character(fields, dirty):
+    """Rebuild a pickled/copied Character"""
+    character = Character(fields)
+    character.mark_clean()
+    for field in dirty:
+        character.mark_dirty(field)
+    return character
+
+def read_field(character, field, default=None):
     """
-    Revive a dead character with 50% health
+    Read a field from a Character or a plain dict without changing it
     
-    Returns: True if revived
+    Character list fields may come back as tuples.
     """
-    # TODO: Implement revival
-    # Restore health to half of max_health
+    if isinstance(character, Character):
+        return character.peek(field, default)
+    return character.get(field, default)
+
+# ============================================================================
+# SAVE FILE PARSING
+# ============================================================================
+
+def decode_int_field(key, value):
+    """Save-file value → int (digits only, as load_character always required)"""
+    if not value.isdigit():
+        raise InvalidSaveDataError(f"Invalid value for {key.decode('utf-8', 'replace')}: "
+                                   f"{value.decode('utf-8', 'replace')}")
+    return int(value)
+
+def decode_str_field(key, value):
+    """Save-file value → str"""
+    return value.decode("utf-8")
+
+def decode_list_field(key, value):
+    """Save-file value → list (comma-separated, empty means [])"""
+    return value.decode("utf-8").split(",") if value else []
+
+FIELD_DECODERS = {int: decode_int_field, str: decode_str_field, list: decode_list_field}
+
+# Save-file key (b"MAX_HEALTH") → (character field, decoder), built once
+SAVE_FIELD_CODECS = {
+    field.upper().encode("ascii"): (field, FIELD_DECODERS[field_type])
+    for field, field_type in (*SAVE_FIELD_TYPES.items(), *SAVE_OPTIONAL_FIELDS.items())
+}
+
+def parse_save_bytes(data):
+    """
+    Parse a whole save file from bytes in one pass
     
-    if "health" not in character or "max_health" not in character:
-        raise KeyError("Character must have 'health' and 'max_health' fields.")
+    Exact keys are looked up straight in SAVE_FIELD_CODECS; only keys
+    with odd spacing or case fall back to strip()/upper().
+    
+    Args:
+        data: Contents of a save file
+    
+    Returns: Dictionary of the twelve saved fields (plus version, if saved)
+    Raises:
+        InvalidSaveDataError if a line, key or value is malformed, or a
+        field is missing
+        SaveFileCorruptedError if the text isn't valid UTF-8
+    """
+    codecs = SAVE_FIELD_CODECS
+    character = {}
+    try:
+        for line in data.splitlines():
+            key, colon, value = line.partition(b":")
+            if not colon:
+                raise InvalidSaveDataError("Malformed line in save file.")
+            codec = codecs.get(key)
+            if codec is None:
+                key = key.strip().upper()
+                codec = codecs.get(key)
+                if codec is None:
+                    raise InvalidSaveDataError(f"Unexpected field: {key.decode('utf-8', 'replace')}")
+            field, decode = codec
+            character[field] = decode(key, value.strip())
+    except UnicodeDecodeError as e:
+        raise SaveFileCorruptedError(f"Could not read save file: {e}")
 
-    # Only revive if dead
-    if character["health"] > 0:
-        return False  # Already alive
+    if len(character) < len(SAVE_FIELD_TYPES) or not SAVE_FIELD_TYPES.keys() <= character.keys():
+        missing = {field.upper() for field in SAVE_FIELD_TYPES if field not in character}
+        raise InvalidSaveDataError(f"Missing fields: {missing}")
+    return character
 
-    # Restore to 50% of max health (rounded down)
-    character["health"] = max(1, character["max_health"] // 2)
+def load_characters(names, save_directory="data/save_games", workers=8):
+    """
+    Load many characters at once, reading files on a thread pool
+    
+    Args:
+        names: Character names to load
+        save_directory: Directory containing save files
+        workers: Number of threads (1 loads in the calling thread)
+    
+    Returns: Dictionary {name: character}
+    Raises:
+        CharacterNotFoundError listing any names without a save
+        SaveFileCorruptedError/InvalidSaveDataError from a bad save
+    """
+    names = list(names)
 
-    return True
+    def load_or_none(name):
+        try:
+            return load_character(name, save_directory)
+        except CharacterNotFoundError:
+            return None
+
+    if workers <= 1 or len(names) <= 1:
+        characters = list(map(load_or_none, names))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            characters = list(pool.map(load_or_none, names))
+
+    missing = [name for name, character in zip(names, characters) if character is None]
+    if missing:
+        raise CharacterNotFoundError(f"No saved character(s): {', '.join(missing)}")
+    return dict(zip(names, characters))
+
+# ============================================================================
+# ATOMIC SAVES
+# ============================================================================
+
+SYNC_MODES = ("none", "always", "group")
+
+def write_file_atomically(filepath, text, sync="none"):
+    """
+    Replace a file's contents via a temp file and rename
+    
+    Args:
+        filepath: File to write
+        text: New contents
+        sync: "none", "always" or "group" (see save_character)
+    
+    Raises: ValueError for an unknown sync mode, OSError on write errors
+    """
+    if sync not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode: {sync}")
+
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            if sync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+
+        if sync == "group":
+            GROUP_COMMITTER.commit(temp_path, filepath)
+        else:
+            os.replace(temp_path, filepath)
+            if sync == "always":
+                fsync_directory(os.path.dirname(filepath))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def fsync_directory(directory):
+    """
+    Flush a directory entry (makes renames durable); no-op where unsupported
+    """
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class GroupCommitter:
+    """
+    Batches atomic writes issued close together into one flush
+    
+    The first writer to arrive leads a batch. While the previous batch is
+    still being flushed (plus an optional extra `window`), later writers
+    join the waiting batch. The leader then fsyncs every temp file in it,
+    renames them into place and fsyncs each directory once. Everyone in
+    the batch returns when that is done, so each save is as durable as
+    with sync="always".
+    """
+    def __init__(self, window=0.0):
+        """
+        Args:
+            window: Extra seconds the batch leader waits for more writers
+        """
+        self.window = window
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.batch = None
+
+    def commit(self, temp_path, filepath):
+        """
+        Durably rename temp_path to filepath as part of the current batch
+        
+        Raises: OSError if flushing or renaming the batch failed
+        """
+        with self.lock:
+            leader = self.batch is None
+            if leader:
+                self.batch = {"files": [], "done": threading.Event(), "error": None}
+            batch = self.batch
+            batch["files"].append((temp_path, filepath))
+
+        if leader:
+            with self.flush_lock:
+                if self.window:
+                    time.sleep(self.window)
+                with self.lock:
+                    self.batch = None
+                try:
+                    self.flush(batch["files"])
+                except OSError as e:
+                    batch["error"] = e
+            batch["done"].set()
+        else:
+            batch["done"].wait()
+
+        if batch["error"] is not None:
+            raise batch["error"]
+
+    def flush(self, files):
+        """Flush, rename and flush directories for one batch of files"""
+        # Only this batch's files are flushed (os.sync would flush every
+        # filesystem, and may return before the data is on disk)
+        sync_file = getattr(os, "fdatasync", os.fsync)
+        for temp_path, filepath in files:
+            with open(temp_path, "rb") as f:
+                sync_file(f.fileno())
+
+        directories = set()
+        for temp_path, filepath in files:
+            os.replace(temp_path, filepath)
+            directories.add(os.path.dirname(filepath))
+        for directory in directories:
+            fsync_directory(directory)
+
+# Shared committer used by save_character(..., sync="group")
+GROUP_COMMITTER = GroupCommitter()
+
+# ============================================================================
+# SAVE LOCKING
+# ============================================================================
+
+# Lock file in each save directory; each character locks one byte of it
+SAVE_LOCK_FILE = ".locks"
+SAVE_LOCK_SLOTS = 1 << 20
+# Threads in one process share fcntl locks, so they also take one of these
+THREAD_LOCK_STRIPES = [threading.Lock() for i in range(256)]
+LOCK_FILES = {}  # lock file path → [descriptor, number of holders]
+LOCK_FILES_LOCK = threading.Lock()
+
+@contextmanager
+def save_lock(character_name, save_directory, exclusive=True):
+    """
+    Hold a character's advisory lock across processes and threads
+    
+    fcntl record locks cover one byte of SAVE_LOCK_FILE chosen by a CRC
+    of the name. So different characters rarely share a lock and nothing
+    is created per character. A shared lock in a directory where the lock
+    file can't be created (e.g. read-only) is skipped, so saves there can
+    still be read.
+    
+    Args:
+        character_name: Character to lock
+        save_directory: Directory holding the save
+        exclusive: False takes a shared lock (for reading)
+    
+    Raises: OSError if an exclusive lock's file can't be opened or created
+    """
+    slot = zlib.crc32(character_name.encode("utf-8")) % SAVE_LOCK_SLOTS
+    with THREAD_LOCK_STRIPES[slot % len(THREAD_LOCK_STRIPES)]:
+        with lock_file_byte(save_directory, slot, exclusive):
+            yield
+
+@contextmanager
+def save_index_lock(save_directory):
+    """
+    Hold a save directory's name index lock across processes
+    
+    Locks the byte of SAVE_LOCK_FILE just past the character slots, so it
+    never shares a lock with a character. Threads are kept apart by
+    SaveIndex.lock, which callers take first.
+    """
+    with lock_file_byte(save_directory, SAVE_LOCK_SLOTS, True):
+        yield
+
+@contextmanager
+def lock_file_byte(save_directory, offset, exclusive):
+    """
+    fcntl-lock one byte of a directory's lock file (see save_lock)
+    
+    The lock file stays open while any thread of this process holds a
+    lock in it and is closed after the last one: closing any descriptor
+    of a file drops every fcntl lock the process holds on it.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        path, fd = open_lock_file(save_directory)
+    except OSError:
+        if exclusive:
+            raise
+        path = None
+    if path is None:
+        yield  # no lock file to share, so read without one
+        return
+
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, 1, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, offset)
+    finally:
+        close_lock_file(path)
+
+def open_lock_file(save_directory):
+    """
+    Open a save directory's lock file, or share the descriptor already open
+    
+    Returns: Tuple (lock file path, descriptor); pass the path to close_lock_file
+    Raises: OSError if the lock file can't be opened or created
+    """
+    path = os.path.abspath(os.path.join(save_directory, SAVE_LOCK_FILE))
+    with LOCK_FILES_LOCK:
+        entry = LOCK_FILES.get(path)
+        if entry is None:
+            entry = LOCK_FILES[path] = [os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 0]
+        entry[1] += 1
+        return path, entry[0]
+
+def close_lock_file(path):
+    """Drop one holder of a lock file, closing it after the last one"""
+    with LOCK_FILES_LOCK:
+        entry = LOCK_FILES[path]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del LOCK_FILES[path]
+            os.close(entry[0])
+
+def read_save_version(filepath):
+    """
+    Get the VERSION stamped in a save file
+    
+    Returns: The version, 0 for a save without one, None if there's no file
+    """
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    start = data.rfind(b"\nVERSION:")
+    if start == -1:
+        return 0
+    value = data[start + len(b"\nVERSION:"):].split(b"\n", 1)[0].strip()
+    return int(value) if value.isdigit() else 0
+
+def read_journal_version(journal_path):
+    """
+    Get the version of the last entry in a journal (see JournalSaveStore)
+    
+    Returns: The version, or None if there's no journal or no versioned entry
+    """
+    try:
+        with open(journal_path, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # torn final write
+        if isinstance(entry, dict) and isinstance(entry.get("version"), int):
+            return entry["version"]
+    return None
+
+def current_save_version(character_name, save_directory):
+    """
+    Get a character's save version, counting journal entries after the snapshot
+    
+    Returns: The version, 0 for an unstamped save, None if there's no save
+    """
+    version = read_save_version(get_save_path(character_name, save_directory))
+    if version is None:
+        return None
+    journal_version = read_journal_version(get_journal_path(character_name, save_directory))
+    return version if journal_version is None else journal_version
+
+def set_saved_version(character, version):
+    """
+    Record the version a character was saved as without marking it changed
+    
+    For copies saved on someone else's behalf (WriteBehindSaver,
+    JournalSaveStore), so the live character's next save expects it.
+    """
+    if version is None:
+        return
+    if isinstance(character, Character):
+        character.version = version
+    elif isinstance(character, TrackedCharacter):
+        dict.__setitem__(character, "version", version)
+    else:
+        character["version"] = version
+
+# ============================================================================
+# JOURNAL SAVE BACKEND
+# ============================================================================
+
+def apply_journal(character, journal_path):
+    """
+    Replay a character's journal on top of its loaded snapshot
+    
+    Each journal line is a JSON object of the fields that changed in one
+    save, plus its new version. A torn last line (crash while appending)
+    is ignored.
+    
+    Returns: Number of entries applied
+    Raises: InvalidSaveDataError if an entry is malformed
+    """
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        raise SaveFileCorruptedError(f"Could not read journal: {e}")
+
+    applied = 0
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            changes = json.loads(line)
+        except ValueError:
+            if number == len(lines) and not line.endswith("\n"):
+                break  # torn final write
+            raise InvalidSaveDataError(f"Malformed journal entry on line {number}.")
+
+        if not isinstance(changes, dict):
+            raise InvalidSaveDataError(f"Malformed journal entry on line {number}.")
+        for field, value in changes.items():
+            expected_type = SAVE_FIELD_TYPES.get(field) or SAVE_OPTIONAL_FIELDS.get(field)
+            if expected_type is None or not isinstance(value, expected_type):
+                raise InvalidSaveDataError(f"Invalid journal field on line {number}: {field}")
+            character[field] = value
+        applied += 1
+    return applied
+
+class JournalSaveStore:
+    """
+    Save backend that appends only the changed fields of each save
+    
+    The first save of a character writes a normal save file (the
+    snapshot). Later saves append one JSON line with the fields that
+    differ from the previous save to {name}_save.journal, and saves that
+    change nothing write nothing. For a tracked character only its dirty
+    fields are compared. Once a journal grows past
+    compact_threshold bytes it is folded into a new snapshot on a
+    background thread. load_character replays snapshot + journal, so
+    characters saved here load with the normal functions.
+    """
+    def __init__(self, save_directory="data/save_games", compact_threshold=64 * 1024):
+        """
+        Args:
+            save_directory: Directory holding snapshots and journals
+            compact_threshold: Journal size in bytes that triggers compaction
+        """
+        self.save_directory = save_directory
+        self.compact_threshold = compact_threshold
+        self.last_saved = {}  # name → copy of the fields as last written
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+        self.compactions = []
+
+    def lock_for(self, character_name):
+        """Get the lock that serializes writes for one character"""
+        with self.locks_guard:
+            if character_name not in self.locks:
+                self.locks[character_name] = threading.Lock()
+            return self.locks[character_name]
+
+    def save_character(self, character):
+        """
+        Save a character, appending only what changed since the last save
+        
+        Every snapshot or journal entry bumps the save's VERSION, checked
+        the same way as save_character.
+        
+        Returns: True if successful
+        Raises: SaveConflictError if the save changed since the character's version
+        """
+        name = character["name"]
+        save_path = get_save_path(name, self.save_directory)
+        with self.lock_for(name):
+            previous = self.last_saved.get(name)
+            if previous is not None and is_saved_to(character, save_path):
+                return True
+            os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+
+            size = 0
+            with save_lock(name, self.save_directory):
+                saved_version = current_save_version(name, self.save_directory)
+                expected_version = read_field(character, "version")
+                if expected_version is not None and saved_version not in (None, expected_version):
+                    raise SaveConflictError(
+                        f"'{name}' was saved elsewhere (version {saved_version}, "
+                        f"expected {expected_version}). Reload before saving."
+                    )
+
+                # Tracked characters only need their dirty fields compared,
+                # unless someone else saved since our last write or the
+                # character's changes are relative to another save
+                fields = SAVE_FIELD_TYPES
+                if saved_version is None:
+                    previous = None
+                elif previous is None or previous.get("version") != saved_version:
+                    previous = snapshot_save_fields(read_save_files(name, self.save_directory))
+                elif is_tracked(character) and character.saved_path == os.path.abspath(save_path):
+                    fields = character.dirty_fields() & SAVE_FIELD_TYPES.keys()
+
+                version = (saved_version or 0) + 1
+                if previous is None:
+                    self.write_snapshot(character, version)
+                    previous = snapshot_save_fields(character)
+                    previous["version"] = version
+                else:
+                    changes = {}
+                    for field in fields:
+                        value = read_field(character, field)
+                        if isinstance(value, (list, tuple)):
+                            value = list(value)
+                        if previous.get(field) != value:
+                            changes[field] = value
+                    if changes:
+                        changes["version"] = version
+                        journal_path = get_journal_path(name, self.save_directory)
+                        with open(journal_path, "a", encoding="utf-8") as f:
+                            f.write(json.dumps(changes, separators=(",", ":")) + "\n")
+                            size = f.tell()
+                        previous.update(changes)
+                    else:
+                        version = saved_version
+            self.last_saved[name] = previous
+
+            if size >= self.compact_threshold:
+                self.start_compaction(name)
+            set_saved_version(character, version)
+            if is_tracked(character):
+                character.saved_path = os.path.abspath(save_path)
+                character.mark_clean()
+        return True
+
+    def load_character(self, character_name):
+        """Load a character (snapshot + journal)"""
+        return load_character(character_name, self.save_directory)
+
+    def list_saved_characters(self):
+        """List characters saved in this store's directory"""
+        return list_saved_characters(self.save_directory)
+
+    def delete_character(self, character_name):
+        """Delete a character's snapshot and journal"""
+        with self.lock_for(character_name):
+            self.last_saved.pop(character_name, None)
+            return delete_character(character_name, self.save_directory)
+
+    def write_snapshot(self, character, version):
+        """
+        Write a full save file atomically and start a fresh journal
+        
+        Callers hold the character's save_lock.
+        
+        Args:
+            character: Character to write
+            version: VERSION to stamp (None for none)
+        """
+        name = character["name"]
+        save_path = get_save_path(name, self.save_directory)
+        write_file_atomically(save_path, format_save_text(character) + format_version_line(version))
+        record_saved_character(name, self.save_directory)
+
+        journal_path = get_journal_path(name, self.save_directory)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+    def compact(self, character_name):
+        """
+        Fold a character's journal into a new snapshot
+        
+        The contents don't change, so the snapshot keeps its VERSION.
+        """
+        with self.lock_for(character_name), save_lock(character_name, self.save_directory):
+            character = read_save_files(character_name, self.save_directory)
+            self.write_snapshot(character, character["version"] or None)
+
+    def start_compaction(self, character_name):
+        """Run compact() on a background thread"""
+        thread = threading.Thread(target=self.compact, args=(character_name,), daemon=True)
+        self.compactions = [t for t in self.compactions if t.is_alive()]
+        self.compactions.append(thread)
+        thread.start()
+
+    def wait_for_compaction(self):
+        """Block until background compactions have finished"""
+        for thread in self.compactions:
+            thread.join()
+        self.compactions = []
+
+def snapshot_save_fields(character):
+    """
+    Copy the saved fields of a character (lists are copied too)
+    
+    The version is copied as well when the character has one, so saving
+    the copy still checks for conflicts (see save_character).
+    """
+    snapshot = {}
+    for field in SAVE_FIELD_TYPES:
+        value = read_field(character, field)
+        snapshot[field] = list(value) if isinstance(value, (list, tuple)) else value
+    version = read_field(character, "version")
+    if version is not None:
+        snapshot["version"] = version
+    return snapshot
+
+# ============================================================================
+# SQLITE SAVE BACKEND
+# ============================================================================
+
+SQLITE_COLUMNS = (
+    "name", "class", "level", "health", "max_health", "strength", "magic",
+    "experience", "gold", "inventory", "active_quests", "completed_quests"
+)
+SQLITE_LIST_COLUMNS = ("inventory", "active_quests", "completed_quests")
+SQLITE_SAVE_SQL = (
+    f"INSERT OR REPLACE INTO characters ({', '.join(f'[{c}]' for c in SQLITE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for c in SQLITE_COLUMNS)})"
+)
+SQLITE_INSERT_MISSING_SQL = SQLITE_SAVE_SQL.replace("OR REPLACE", "OR IGNORE", 1)
+SQLITE_LOAD_SQL = (
+    f"SELECT {', '.join(f'[{c}]' for c in SQLITE_COLUMNS)} FROM characters WHERE name = ?"
+)
+SQLITE_UPDATE_SQL = {}  # changed columns → UPDATE statement (see sqlite_update_sql)
+
+class SQLiteCharacterStore:
+    """
+    Character saves kept in one SQLite database instead of one file each
+    
+    Has the same operations as the file functions (save_character,
+    load_character, list_saved_characters, delete_character) plus
+    save_characters/load_characters that handle a whole batch in one
+    transaction. Connections come from a small pool so several threads
+    can use one store; SQL text is constant so sqlite reuses its compiled
+    statements.
+    """
+    def __init__(self, database="data/save_games/characters.db", pool_size=4):
+        """
+        Open (or create) the database
+        
+        Args:
+            database: Path of the SQLite file
+            pool_size: Number of connections kept open
+        
+        Raises: SaveFileCorruptedError if the file isn't a usable database
+        """
+        directory = os.path.dirname(database)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.database = database
+        self.pool = queue.Queue()
+        try:
+            for i in range(pool_size):
+                connection = sqlite3.connect(database, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                self.pool.put(connection)
+            with self.connection() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS characters ("
+                    "name TEXT PRIMARY KEY, class TEXT NOT NULL, "
+                    "level INTEGER NOT NULL, health INTEGER NOT NULL, "
+                    "max_health INTEGER NOT NULL, strength INTEGER NOT NULL, "
+                    "magic INTEGER NOT NULL, experience INTEGER NOT NULL, "
+                    "gold INTEGER NOT NULL, inventory TEXT NOT NULL, "
+                    "active_quests TEXT NOT NULL, completed_quests TEXT NOT NULL)"
+                )
+        except sqlite3.DatabaseError as e:
+            self.close()
+            raise SaveFileCorruptedError(f"Could not open save database: {e}")
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a pooled connection for one transaction
+        
+        Commits if the block succeeds and rolls back if it raises.
+        """
+        connection = self.pool.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self.pool.put(connection)
+
+    def close(self):
+        """Close every pooled connection"""
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def save_character(self, character):
+        """
+        Insert or replace one character
+        
+        Returns: True if successful
+        """
+        return self.save_characters([character]) == 1
+
+    def save_characters(self, batch):
+        """
+        Save many characters in a single transaction
+        
+        Tracked characters last loaded from or saved to this database only
+        update their dirty columns, and unchanged ones are only inserted if
+        the database doesn't have them yet. Anything else writes the whole
+        row, since its dirty fields say nothing about what this database has.
+        
+        Returns: Number of characters saved
+        """
+        database_path = os.path.abspath(self.database)
+        with self.connection() as connection:
+            for character in batch:
+                if is_saved_to(character, database_path):
+                    connection.execute(SQLITE_INSERT_MISSING_SQL, character_to_row(character))
+                    continue
+                columns = None
+                if is_tracked(character) and character.saved_path == database_path:
+                    dirty = character.dirty_fields()
+                    if "name" not in dirty:
+                        columns = tuple(c for c in SQLITE_COLUMNS if c in dirty)
+                if columns:
+                    row = character_to_row(character)
+                    values = [row[SQLITE_COLUMNS.index(c)] for c in columns]
+                    cursor = connection.execute(sqlite_update_sql(columns), values + [row[0]])
+                    if cursor.rowcount:
+                        continue
+                connection.execute(SQLITE_SAVE_SQL, character_to_row(character))
+
+        for character in batch:
+            if is_tracked(character):
+                character.saved_path = database_path
+                character.mark_clean()
+        return len(batch)
+
+    def load_character(self, character_name):
+        """
+        Load one character
+        
+        Returns: Character dictionary
+        Raises: CharacterNotFoundError if the character isn't saved
+        """
+        return self.load_characters([character_name])[character_name]
+
+    def load_characters(self, names):
+        """
+        Load many characters in a single transaction
+        
+        Returns: Dictionary {name: character dictionary}
+        Raises: CharacterNotFoundError listing any names that aren't saved
+        """
+        loaded = {}
+        with self.connection() as connection:
+            for name in names:
+                row = connection.execute(SQLITE_LOAD_SQL, (name,)).fetchone()
+                if row is not None:
+                    loaded[name] = row_to_character(row)
+                    loaded[name].saved_path = os.path.abspath(self.database)
+
+        missing = [name for name in names if name not in loaded]
+        if missing:
+            raise CharacterNotFoundError(f"No saved character(s): {', '.join(missing)}")
+        return loaded
+
+    def list_saved_characters(self):
+        """
+        Get names of all saved characters
+        
+        Returns: List of names in alphabetical order
+        """
+        with self.connection() as connection:
+            rows = connection.execute("SELECT name FROM characters ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def delete_character(self, character_name):
+        """
+        Delete a character
+        
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if the character isn't saved
+        """
+        with self.connection() as connection:
+            cursor = connection.execute("DELETE FROM characters WHERE name = ?", (character_name,))
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"No save found for '{character_name}'.")
+        return True
+
+def sqlite_update_sql(columns):
+    """
+    Get (and remember) the UPDATE statement for a set of changed columns
+    
+    Args:
+        columns: Tuple of column names in SQLITE_COLUMNS order
+    """
+    sql = SQLITE_UPDATE_SQL.get(columns)
+    if sql is None:
+        assignments = ", ".join(f"[{column}] = ?" for column in columns)
+        sql = SQLITE_UPDATE_SQL[columns] = f"UPDATE characters SET {assignments} WHERE name = ?"
+    return sql
+
+def character_to_row(character):
+    """
+    Convert a character into a tuple in SQLITE_COLUMNS order
+    
+    Lists are stored comma-separated, the same as in save files.
+    """
+    return tuple(
+        ",".join(read_field(character, column, [])) if column in SQLITE_LIST_COLUMNS
+        else character[column]
+        for column in SQLITE_COLUMNS
+    )
+
+def row_to_character(row):
+    """
+    Convert a database row back into a character dictionary
+    
+    Raises: InvalidSaveDataError if a column has the wrong type
+    """
+    character = {}
+    for column, value in zip(SQLITE_COLUMNS, row):
+        if column in SQLITE_LIST_COLUMNS:
+            character[column] = value.split(",") if value else []
+        elif not isinstance(value, SAVE_FIELD_TYPES[column]):
+            raise InvalidSaveDataError(f"Invalid value for {column}: {value!r}")
+        else:
+            character[column] = value
+    return track_character(character)
+
+# ============================================================================
+# WRITE-BEHIND SAVES
+# ============================================================================
+
+class WriteBehindSaver:
+    """
+    Saves characters on a background thread so callers never wait on disk
+    
+    save() copies the character's saved fields and marks it dirty. If the
+    same character is saved again before the writer gets to it, only the
+    newest copy is written, and a tracked character with no changes since
+    it was last queued isn't queued at all. A tracked character's dirty
+    flags move to the queued copy; if the write fails they are put back
+    on the character, so its next save() tries again. barrier() waits
+    until a character's pending save is on disk (use it before anything
+    that must not be lost, like a death), and flush()/close() do the
+    same for everyone.
+    """
+    def __init__(self, save_directory="data/save_games", save_function=None):
+        """
+        Args:
+            save_directory: Passed to save_function
+            save_function: Called as save_function(character, save_directory);
+                           defaults to save_character
+        """
+        self.save_directory = save_directory
+        self.save_function = save_function or save_character
+        self.condition = threading.Condition()
+        self.dirty = {}       # name → (newest copy, character, its dirty fields)
+        self.writing = set()  # names the writer is saving right now
+        self.errors = {}      # name → exception from the last failed write
+        self.running = True
+        self.writer = threading.Thread(target=self.run, daemon=True)
+        self.writer.start()
+
+    def save(self, character):
+        """
+        Queue a save and return immediately
+        
+        Returns: True (the write itself happens later)
+        Raises: RuntimeError if the saver has been closed
+        """
+        with self.condition:
+            if not self.running:
+                raise RuntimeError("WriteBehindSaver is closed.")
+            filepath = get_save_path(character["name"], self.save_directory)
+            if is_saved_to(character, filepath):
+                return True  # already saved or queued
+            snapshot = snapshot_save_fields(character)
+            fields = frozenset()
+            if is_tracked(character):
+                fields = character.dirty_fields()
+                character.saved_path = os.path.abspath(filepath)
+                character.mark_clean()
+            queued = self.dirty.get(snapshot["name"])
+            if queued is not None:
+                fields |= queued[2]
+            self.dirty[snapshot["name"]] = (snapshot, character, fields)
+            self.condition.notify_all()
+        return True
+
+    def run(self):
+        """Writer thread: save dirty characters until closed"""
+        while True:
+            with self.condition:
+                while not self.dirty and self.running:
+                    self.condition.wait()
+                if not self.dirty and not self.running:
+                    return
+                batch = self.dirty
+                self.dirty = {}
+                self.writing = set(batch)
+
+            for name, (snapshot, character, fields) in batch.items():
+                try:
+                    self.save_function(snapshot, self.save_directory)
+                    error = None
+                except Exception as e:
+                    error = e
+                with self.condition:
+                    if error is None:
+                        self.errors.pop(name, None)
+                        self.record_version(name, snapshot, character)
+                    else:
+                        self.errors[name] = error
+                        self.restore_dirty_fields(name, character, fields)
+                    self.writing.discard(name)
+                    self.condition.notify_all()
+
+    def record_version(self, name, snapshot, character):
+        """Pass a written copy's new version on (caller holds the condition)"""
+        version = snapshot.get("version")
+        if version is None:
+            return
+        set_saved_version(character, version)
+        queued = self.dirty.get(name)
+        if queued is not None and queued[1] is character:
+            # The newer copy was taken before this write finished
+            queued[0]["version"] = version
+
+    def restore_dirty_fields(self, name, character, fields):
+        """Re-flag the fields of a failed write (caller holds the condition)"""
+        queued = self.dirty.get(name)
+        if queued is not None:
+            # A newer copy is already queued; it carries the flags instead
+            self.dirty[name] = (queued[0], queued[1], queued[2] | fields)
+        elif is_tracked(character):
+            for field in fields:
+                character.mark_dirty(field)
+
+    def pending(self, character_name=None):
+        """True if a save (for one character, or any) hasn't been written yet"""
+        if character_name is None:
+            return bool(self.dirty or self.writing)
+        return character_name in self.dirty or character_name in self.writing
+
+    def barrier(self, character_name=None, timeout=None):
+        """
+        Wait until queued saves are on disk
+        
+        Args:
+            character_name: Wait only for this character (None = everyone)
+            timeout: Seconds to wait at most (None = no limit)
+        
+        Returns: True if everything requested was written
+        Raises: The exception from a failed write, if there was one
+        """
+        with self.condition:
+            done = self.condition.wait_for(lambda: not self.pending(character_name), timeout)
+            if character_name is None:
+                failed = dict(self.errors)
+            else:
+                failed = {character_name: self.errors[character_name]} if character_name in self.errors else {}
+        if failed:
+            raise next(iter(failed.values()))
+        return done
+
+    def flush(self, timeout=None):
+        """Wait until every queued save is on disk (see barrier)"""
+        return self.barrier(None, timeout)
+
+    def close(self):
+        """Write everything still queued and stop the writer thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.writer.join()
+        self.flush()
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+# Every live CharacterCache, so delete_character can invalidate them
+CHARACTER_CACHES = weakref.WeakSet()
+
+class CharacterCache:
+    """
+    Bounded in-memory cache of loaded characters with LRU eviction
+    
+    get() returns the cached character (the same object every time) or
+    loads it on a miss. save() either writes through to the store right
+    away or, with write_back=True, only marks the entry dirty; dirty
+    entries are written when evicted and by flush(). The cache can be
+    bounded by entry count, by size (the length of each character's save
+    text), or both. delete_character invalidates matching entries.
+    
+    Counters for hits, misses and evictions are in stats().
+    """
+    def __init__(self, save_directory="data/save_games", max_entries=1024,
+                 max_bytes=None, write_back=False, store=None):
+        """
+        Args:
+            save_directory: Directory used by the save file functions
+            max_entries: Most characters kept (None = no limit)
+            max_bytes: Most save-text bytes kept (None = no limit)
+            write_back: Delay saves until eviction/flush instead of writing through
+            store: Optional backend with load_character(name),
+                   save_character(character) and delete_character(name)
+                   (JournalSaveStore, SQLiteCharacterStore) instead of files
+        """
+        self.save_directory = save_directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.write_back = write_back
+        self.store = store
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # name → (character, size), oldest first
+        self.dirty = set()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CHARACTER_CACHES.add(self)
+
+    def get(self, character_name):
+        """
+        Get a character, loading it on a miss
+        
+        Raises: Whatever load_character raises (CharacterNotFoundError, ...)
+        """
+        with self.lock:
+            entry = self.entries.get(character_name)
+            if entry is not None:
+                self.entries.move_to_end(character_name)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        character = self.load_from_store(character_name)
+        with self.lock:
+            entry = self.entries.get(character_name)
+            if entry is not None:
+                return entry[0]  # another thread loaded it first
+            evicted = self.insert(character_name, character)
+        self.write_evicted(evicted)
+        return character
+
+    def save(self, character):
+        """
+        Save a character through the cache
+        
+        Returns: True if successful
+        """
+        name = character["name"]
+        if not self.write_back:
+            self.save_to_store(character)
+        with self.lock:
+            if self.write_back:
+                # Marked first, so evicting it right away still writes it
+                self.dirty.add(name)
+            evicted = self.insert(name, character)
+        self.write_evicted(evicted)
+        return True
+
+    def invalidate(self, character_name):
+        """Forget a cached character without saving it"""
+        with self.lock:
+            entry = self.entries.pop(character_name, None)
+            if entry is not None:
+                self.size -= entry[1]
+            self.dirty.discard(character_name)
+
+    def delete(self, character_name):
+        """Delete a character from the store (and the cache)"""
+        self.invalidate(character_name)
+        if self.store is not None:
+            return self.store.delete_character(character_name)
+        return delete_character(character_name, self.save_directory)
+
+    def flush(self):
+        """
+        Write every dirty entry (write-back mode)
+        
+        Returns: Number of characters written
+        """
+        with self.lock:
+            pending = [self.entries[name][0] for name in self.dirty]
+            self.dirty.clear()
+        for done, character in enumerate(pending):
+            try:
+                self.save_to_store(character)
+            except Exception:
+                # Keep unsaved entries dirty so a later flush retries them
+                with self.lock:
+                    self.dirty.update(
+                        c["name"] for c in pending[done:] if c["name"] in self.entries
+                    )
+                raise
+        return len(pending)
+
+    def stats(self):
+        """
+        Get cache counters
+        
+        Returns: Dictionary with hits, misses, evictions, entries, bytes, dirty
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "dirty": len(self.dirty),
+            }
+
+    def matches_directory(self, save_directory):
+        """True if this cache reads the save files of save_directory"""
+        return self.store is None and os.path.abspath(self.save_directory) == os.path.abspath(save_directory)
+
+    def insert(self, name, character):
+        """
+        Add or refresh an entry and evict as needed (lock held)
+        
+        Returns: List of evicted dirty characters that still need saving
+        """
+        old = self.entries.pop(name, None)
+        if old is not None:
+            self.size -= old[1]
+        size = len(format_save_text(character)) if self.max_bytes is not None else 0
+        self.entries[name] = (character, size)
+        self.size += size
+
+        evicted = []
+        while self.entries and (
+            (self.max_entries is not None and len(self.entries) > self.max_entries)
+            or (self.max_bytes is not None and self.size > self.max_bytes)
+        ):
+            old_name, (old_character, old_size) = self.entries.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+            if old_name in self.dirty:
+                self.dirty.discard(old_name)
+                evicted.append(old_character)
+        return evicted
+
+    def write_evicted(self, evicted):
+        """Save dirty characters that were pushed out of the cache"""
+        for character in evicted:
+            self.save_to_store(character)
+
+    def load_from_store(self, character_name):
+        """Load from the backend store, or from save files"""
+        if self.store is not None:
+            return self.store.load_character(character_name)
+        return load_character(character_name, self.save_directory)
+
+    def save_to_store(self, character):
+        """Save to the backend store, or to save files"""
+        if self.store is not None:
+            return self.store.save_character(character)
+        return save_character(character, self.save_directory)
+
+def invalidate_cached_character(character_name, save_directory):
+    """Drop a character from every CharacterCache reading save_directory"""
+    for cache in list(CHARACTER_CACHES):
+        if cache.matches_directory(save_directory):
+            cache.invalidate(character_name)
+
+# ============================================================================
+# PROGRESSION EVENTS
+# ============================================================================
+
+EVENT_TYPES = ("xp_gained", "level_up", "gold_changed", "healed", "revived")
+
+class EventBus:
+    """
+    Synchronous publish/subscribe for character progression events
+    
+    Handlers are called in the emitting thread with one event dictionary:
+    {"event": name, "character": character name, ...event data}.
+    
+    Events (and the data in them):
+    - xp_gained: amount, experience
+    - level_up: old_level, new_level, levels (range), stat_gains
+    - gold_changed: amount, gold
+    - healed: amount, health
+    - revived: health
+    
+    `handlers` only holds events with at least one handler, so emitting
+    code checks `if "xp_gained" in EVENTS.handlers` before building an
+    event; with nobody subscribed an event costs one dict lookup.
+    """
+    def __init__(self):
+        self.handlers = {}  # event → tuple of handlers (never empty)
+        self.lock = threading.Lock()
+
+    def subscribe(self, handler, *events):
+        """
+        Call handler for the given events (all events if none are given)
+        
+        Returns: handler (so this works as a decorator)
+        Raises: ValueError for an unknown event name
+        """
+        for event in events or EVENT_TYPES:
+            if event not in EVENT_TYPES:
+                raise ValueError(f"Unknown event: {event}")
+            with self.lock:
+                self.handlers[event] = self.handlers.get(event, ()) + (handler,)
+        return handler
+
+    def unsubscribe(self, handler, *events):
+        """Stop calling handler for the given events (all if none are given)"""
+        with self.lock:
+            for event in events or EVENT_TYPES:
+                remaining = tuple(h for h in self.handlers.get(event, ()) if h is not handler)
+                if remaining:
+                    self.handlers[event] = remaining
+                else:
+                    self.handlers.pop(event, None)
+
+    def emit(self, event, character, **data):
+        """Send an event about character to every handler subscribed to it"""
+        handlers = self.handlers.get(event)
+        if not handlers:
+            return
+        data["event"] = event
+        data["character"] = character["name"]
+        for handler in handlers:
+            handler(data)
+
+# Bus the character functions report to
+EVENTS = EventBus()
+
+class ConsoleSink:
+    """Event handler that prints events the way the game always has"""
+    def __call__(self, event):
+        print(format_event(event))
+
+class BufferedLogSink:
+    """
+    Event handler that collects events and writes them in batches
+    
+    Events are kept in `events` until buffer_size of them have arrived
+    or flush() is called, then written to stream as JSON lines in a
+    single write. Without a stream they simply stay in memory until
+    flush() hands them back.
+    """
+    def __init__(self, stream=None, buffer_size=1000):
+        """
+        Args:
+            stream: Text file to write to (None = keep in memory)
+            buffer_size: Events held before writing automatically
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            self.events.append(event)
+            full = self.stream is not None and len(self.events) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out (or hand back) the buffered events
+        
+        Returns: List of the events that were flushed
+        """
+        with self.lock:
+            events, self.events = self.events, []
+        if self.stream is not None and events:
+            self.stream.write("".join(
+                json.dumps(event, default=list, separators=(",", ":")) + "\n" for event in events
+            ))
+        return events
+
+class NullSink:
+    """Event handler that ignores everything (for measuring bus overhead)"""
+    def __call__(self, event):
+        pass
+
+def format_event(event):
+    """
+    Describe an event the way gain_experience used to print it
+    
+    Returns: Message text
+    """
+    kind = event["event"]
+    if kind == "xp_gained":
+        return f"\n+{event['amount']} XP gained!"
+    if kind == "level_up":
+        gained = len(event["levels"])
+        times = f" x{gained}" if gained > 1 else ""
+        stats = event["stat_gains"]
+        return (
+            f"\n🎉 LEVEL UP{times}! You are now level {event['new_level']}!\n"
+            f"+{stats['max_health']} Max Health, +{stats['strength']} Strength, +{stats['magic']} Magic"
+        )
+    if kind == "gold_changed":
+        return f"{event['amount']:+} gold (now {event['gold']})"
+    if kind == "healed":
+        return f"{event['character']} healed {event['amount']} HP (now {event['health']})"
+    return f"{event['character']} was revived with {event['health']} HP"
+
+# ============================================================================
+# CHARACTER OPERATIONS
+# ============================================================================
+
+def gain_experience(character, xp_amount):
+    """
+    Add experience to character and handle level ups
+    
+    Level up formula: level_up_xp = current_level * 100
+    Example when leveling up:
+    - Increase level by 1
+    - Increase max_health by 10
+    - Increase strength by 2
+    - Increase magic by 2
+    - Restore health to max_health
+    
+    Returns: True if the character leveled up
+    Raises: CharacterDeadError if character health is 0
+    """
+    # TODO: Implement experience gain and leveling
+    # Check if character is dead first
+    # Add experience
+    # Check for level up (can level up multiple times)
+    # Update stats on level up
+     # Cannot gain XP if dead
+    
+    if character["health"] <= 0:
+        raise CharacterDeadError("Character is dead and cannot gain experience.")
+
+    # Add XP and apply every level-up at once (see apply_experience);
+    # messages go out as xp_gained/level_up events instead of prints
+    result = apply_experience(character, xp_amount)
+    return len(result["levels"]) > 0
+    pass
+
+def add_gold(character, amount):
+    """
+    Add gold to character's inventory
+    
+    Args:
+        character: Character dictionary
+        amount: Amount of gold to add (can be negative for spending)
+    
+    Returns: New gold total
+    Raises: ValueError if result would be negative
+    """
+    # TODO: Implement gold management
+    # Check that result won't be negative
+    # Update character's gold
+      # Ensure character has a gold field
+    
+    if "gold" not in character:
+        raise KeyError("Character dictionary must contain a 'gold' field.")
+
+    new_gold = character["gold"] + amount
+
+    # Prevent negative gold
+    if new_gold < 0:
+        raise ValueError(
+            f"Cannot remove {abs(amount)} gold — result would be negative."
+        )
+
+    # Update gold
+    character["gold"] = new_gold
+    if "gold_changed" in EVENTS.handlers:
+        EVENTS.emit("gold_changed", character, amount=amount, gold=new_gold)
+    return new_gold
+    pass
+
+def heal_character(character, amount):
+    """
+    Heal character by specified amount
+    
+    Health cannot exceed max_health
+    
+    Returns: Actual amount healed
+    """
+    # TODO: Implement healing
+    # Calculate actual healing (don't exceed max_health)
+    # Update character health
+    
+    if amount < 0:
+        raise ValueError("Healing amount cannot be negative.")
+
+    current_hp = character.get("health")
+    max_hp = character.get("max_health")
+
+    if current_hp is None or max_hp is None:
+        raise KeyError("Character must have 'health' and 'max_health' fields.")
+
+    # Calculate heal without exceeding max health
+    heal_amount = min(amount, max_hp - current_hp)
+
+    # Apply healing
+    character["health"] = current_hp + heal_amount
+    if "healed" in EVENTS.handlers:
+        EVENTS.emit("healed", character, amount=heal_amount, health=character["health"])
+
+    return heal_amount
     pass
 
+def is_character_dead(character):
+    """
+    Check if character's health is 0 or below
+    
+    Returns: True if dead, False if alive
+    """
+    # TODO: Implement death check
+    
+    if "health" not in character:
+        raise KeyError("Character dictionary must contain a 'health' field.")
+    
+    return character["health"] <= 0
+    pass
+
+def revive_character(character):
+    """
+    Revive a dead character with 50% health
+    
+    Returns: True if revived
+    """
+    # TODO: Implement revival
+    # Restore health to half of max_health
+    
+    if "health" not in character or "max_health" not in character:
+        raise KeyError("Character must have 'health' and 'max_health' fields.")
+
+    # Only revive if dead
+    if character["health"] > 0:
+        return False  # Already alive
+
+    # Restore to 50% of max health (rounded down)
+    character["health"] = max(1, character["max_health"] // 2)
+    if "revived" in EVENTS.handlers:
+        EVENTS.emit("revived", character, health=character["health"])
+
+    return True
+    pass
+
+# ============================================================================
+# LEVELING
+# ============================================================================
+
+# Reaching level L + 1 from level L costs L * LEVEL_XP_STEP experience
+LEVEL_XP_STEP = 100
+# Stat increases per level gained
+LEVEL_UP_STATS = {"max_health": 10, "strength": 2, "magic": 2}
+
+def levels_for_experience(level, experience):
+    """
+    Work out how many levels a character can gain without looping
+    
+    Gaining k levels from level L costs 100 * (L + L+1 + ... + L+k-1)
+    = 50 * (k² + (2L - 1)k), so k is the largest value with
+    k² + (2L - 1)k <= experience // 50, found with an integer square root.
+    Negative experience is treated as 0 there, so it never costs levels.
+    
+    Args:
+        level: Current level (1 or more)
+        experience: Experience held, including any just gained
+    
+    Returns: Tuple (levels gained, experience left over)
+    """
+    half_step = LEVEL_XP_STEP // 2
+    b = 2 * level - 1
+    units = max(experience // half_step, 0)
+    k = (isqrt(b * b + 4 * units) - b) // 2
+    return k, experience - half_step * (k * k + b * k)
+
+def apply_experience(character, xp_amount):
+    """
+    Add experience and apply every level-up it earns in one step
+    
+    Emits xp_gained, and level_up if any levels were gained (see EventBus).
+    
+    Returns: Dictionary with:
+        - xp_gained, old_level, new_level
+        - levels: range of the levels reached (empty if none)
+        - stat_gains: {stat: total increase} for LEVEL_UP_STATS
+    Raises: CharacterDeadError if character health is 0
+    """
+    if character["health"] <= 0:
+        raise CharacterDeadError("Character is dead and cannot gain experience.")
+
+    old_level = character["level"]
+    gained, experience = levels_for_experience(old_level, character["experience"] + xp_amount)
+
+    character["experience"] = experience
+    stat_gains = {stat: amount * gained for stat, amount in LEVEL_UP_STATS.items()}
+    if gained:
+        character["level"] = old_level + gained
+        for stat, amount in stat_gains.items():
+            character[stat] += amount
+        # Heal to full on level up
+        character["health"] = character["max_health"]
+
+    if "xp_gained" in EVENTS.handlers:
+        EVENTS.emit("xp_gained", character, amount=xp_amount, experience=experience)
+    if gained and "level_up" in EVENTS.handlers:
+        EVENTS.emit(
+            "level_up", character, old_level=old_level, new_level=old_level + gained,
+            levels=range(old_level + 1, old_level + gained + 1), stat_gains=stat_gains,
+        )
+
+    return {
+        "xp_gained": xp_amount,
+        "old_level": old_level,
+        "new_level": old_level + gained,
+        "levels": range(old_level + 1, old_level + gained + 1),
+        "stat_gains": stat_gains,
+    }
+
+# ============================================================================
+# CHARACTER ROSTERS
+# ============================================================================
+
+# Numeric fields stored as one typed array each
+ROSTER_COLUMNS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+ROSTER_LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+class Roster:
+    """
+    Many characters stored as parallel columns (struct of arrays)
+    
+    Each numeric field is one array.array of 64-bit ints; names, classes
+    and the list fields are plain lists (list fields hold a shared empty
+    tuple until a row's list is used). Bulk operations work on whole
+    columns with map/operator/compress, optionally limited by a mask: a
+    list of booleans with one entry per row, like ItemColumns masks.
+    
+    roster[i] is a dict-like view of row i that reads and writes the
+    columns, so a row can be passed to the single-character functions.
+    """
+    def __init__(self):
+        """Create an empty roster; use create_characters/append to fill it"""
+        self.names = []
+        self.classes = []
+        for column in ROSTER_COLUMNS:
+            setattr(self, column, array("q"))
+        for field in ROSTER_LIST_FIELDS:
+            setattr(self, field, [])
+        self.versions = {}  # row index → save version, for rows that were saved
+
+    @classmethod
+    def from_characters(cls, characters):
+        """Build a roster from character dictionaries"""
+        roster = cls()
+        for character in characters:
+            roster.append(character)
+        return roster
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("Roster index out of range")
+        return RosterRow(self, index % len(self))
+
+    def __iter__(self):
+        return (RosterRow(self, index) for index in range(len(self)))
+
+    def append(self, character):
+        """
+        Add one character to the end of every column
+        
+        Returns: Index of the new row
+        """
+        self.names.append(character["name"])
+        self.classes.append(character["class"])
+        for column in ROSTER_COLUMNS:
+            getattr(self, column).append(character[column])
+        for field in ROSTER_LIST_FIELDS:
+            getattr(self, field).append(tuple(character.get(field, ())))
+        return len(self) - 1
+
+    def create_characters(self, names, character_class):
+        """
+        Bulk create_character: add one new character per name
+        
+        Returns: range of the new row indexes
+        Raises: InvalidCharacterClassError if class is not valid
+        """
+        template = create_character("", character_class)
+        names = list(names)
+        start = len(self)
+        count = len(names)
+
+        self.names.extend(names)
+        self.classes.extend(repeat(character_class, count))
+        for column in ROSTER_COLUMNS:
+            getattr(self, column).extend(repeat(template[column], count))
+        for field in ROSTER_LIST_FIELDS:
+            getattr(self, field).extend(repeat((), count))
+        return range(start, start + count)
+
+    def mask_for_rows(self, indexes):
+        """Build a mask that is True only at the given row indexes"""
+        mask = [False] * len(self)
+        for index in indexes:
+            mask[index] = True
+        return mask
+
+    def select(self, mask):
+        """Get the row indexes where mask is True"""
+        return list(compress(range(len(self)), mask))
+
+    def masked_deltas(self, old, new, mask):
+        """Per-row new - old, zeroed where mask is False (mask None = all rows)"""
+        deltas = map(operator.sub, new, old)
+        if mask is not None:
+            deltas = map(operator.mul, deltas, mask)
+        return array("q", deltas)
+
+    def heal_characters(self, amount, mask=None):
+        """
+        Bulk heal_character: heal rows by amount, capped at max_health
+        
+        Returns: array of the amount each row was healed (0 outside mask)
+        Raises: ValueError if amount is negative
+        """
+        if amount < 0:
+            raise ValueError("Healing amount cannot be negative.")
+        healed = array("q", map(min, map(operator.add, self.health, repeat(amount)), self.max_health))
+        deltas = self.masked_deltas(self.health, healed, mask)
+        if mask is None:
+            self.health = healed
+        else:
+            self.health = array("q", map(operator.add, self.health, deltas))
+        return deltas
+
+    def add_gold(self, amount, mask=None):
+        """
+        Bulk add_gold: add amount (may be negative) to the rows in mask
+        
+        Nothing changes if any selected row would go below zero.
+        
+        Returns: array of the new gold totals
+        Raises: ValueError if a result would be negative
+        """
+        added = repeat(amount, len(self))
+        if mask is not None:
+            added = map(operator.mul, added, mask)
+        gold = array("q", map(operator.add, self.gold, added))
+        if len(gold) and min(gold) < 0:
+            raise ValueError(f"Cannot remove {abs(amount)} gold — result would be negative.")
+        self.gold = gold
+        return gold
+
+    def is_character_dead(self, mask=None):
+        """
+        Bulk is_character_dead
+        
+        Returns: Mask that is True for rows with health 0 or below (and in mask)
+        """
+        dead = map(operator.le, self.health, repeat(0))
+        if mask is not None:
+            dead = map(operator.and_, dead, mask)
+        return list(dead)
+
+    def revive_characters(self, mask=None):
+        """
+        Bulk revive_character: dead rows in mask get 50% health (at least 1)
+        
+        Returns: Mask of the rows that were revived
+        """
+        revived = self.is_character_dead(mask)
+        # Dead rows are usually few, so only those are touched
+        health = self.health
+        max_health = self.max_health
+        for index in compress(range(len(self)), revived):
+            health[index] = max(1, max_health[index] // 2)
+        return revived
+
+    def gain_experience(self, xp_amount, mask=None):
+        """
+        Bulk gain_experience using the closed form from levels_for_experience
+        
+        Dead rows don't gain experience (the single-character version
+        raises CharacterDeadError instead). No events are emitted.
+        
+        Returns: array of levels gained per row
+        """
+        alive = map(operator.gt, self.health, repeat(0))
+        if mask is not None:
+            alive = map(operator.and_, alive, mask)
+        awarded = map(operator.mul, repeat(xp_amount), alive)
+        experience = array("q", map(operator.add, self.experience, awarded))
+
+        half_step = LEVEL_XP_STEP // 2
+        b = array("q", map(operator.sub, map(operator.mul, self.level, repeat(2)), repeat(1)))
+        units = map(max, map(operator.floordiv, experience, repeat(half_step)), repeat(0))
+        discriminant = map(operator.add, map(operator.mul, b, b), map(operator.mul, units, repeat(4)))
+        roots = map(isqrt, discriminant)
+        gained = array("q", map(operator.floordiv, map(operator.sub, roots, b), repeat(2)))
+
+        # experience left = experience - 50 * (k² + b·k)
+        k_squared = map(operator.mul, gained, gained)
+        b_k = map(operator.mul, b, gained)
+        spent = map(operator.mul, map(operator.add, k_squared, b_k), repeat(half_step))
+        self.experience = array("q", map(operator.sub, experience, spent))
+        self.level = array("q", map(operator.add, self.level, gained))
+        for stat, amount in LEVEL_UP_STATS.items():
+            column = getattr(self, stat)
+            setattr(self, stat, array("q", map(operator.add, column, map(operator.mul, gained, repeat(amount)))))
+
+        # Rows that leveled up are healed to full
+        leveled = list(map(bool, gained))
+        deltas = self.masked_deltas(self.health, self.max_health, leveled)
+        self.health = array("q", map(operator.add, self.health, deltas))
+        return gained
+
+    def to_character(self, index):
+        """Copy row index out as a standalone Character"""
+        return Character(self[index])
+
+class RosterRow(MutableMapping):
+    """
+    Dict-like view of one roster row; reads and writes go to the columns
+    
+    Keys are the twelve saved fields, plus version once the row has been
+    saved. Rows can't gain or lose other keys.
+    """
+    __slots__ = ("roster", "index")
+
+    def __init__(self, roster, index):
+        self.roster = roster
+        self.index = index
+
+    def __getitem__(self, field):
+        if field == "name":
+            return self.roster.names[self.index]
+        if field == "class":
+            return self.roster.classes[self.index]
+        if field in ROSTER_COLUMNS:
+            return getattr(self.roster, field)[self.index]
+        if field in ROSTER_LIST_FIELDS:
+            values = getattr(self.roster, field)
+            if type(values[self.index]) is tuple:
+                values[self.index] = list(values[self.index])
+            return values[self.index]
+        if field == "version" and self.index in self.roster.versions:
+            return self.roster.versions[self.index]
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        if field == "name":
+            self.roster.names[self.index] = value
+        elif field == "class":
+            self.roster.classes[self.index] = value
+        elif field in ROSTER_COLUMNS:
+            getattr(self.roster, field)[self.index] = value
+        elif field in ROSTER_LIST_FIELDS:
+            getattr(self.roster, field)[self.index] = list(value)
+        elif field == "version":
+            self.roster.versions[self.index] = value
+        else:
+            raise KeyError(f"Roster rows have no field '{field}'.")
+
+    def __delitem__(self, field):
+        raise TypeError("Roster rows can't remove fields.")
+
+    def __iter__(self):
+        yield from SAVE_FIELD_TYPES
+        if self.index in self.roster.versions:
+            yield "version"
+
+    def __len__(self):
+        return len(SAVE_FIELD_TYPES) + (self.index in self.roster.versions)
+
+    def __repr__(self):
+        return f"RosterRow({self.index}, {dict(self)!r})"
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -123,3 +123,7 @@ class InvalidSaveDataError(GameError):
     """Raised when save file contains invalid data"""
     pass
 
+class SaveConflictError(GameError):
+    """Raised when a save was changed by someone else since it was loaded"""
+    pass
+
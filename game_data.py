@@ -10,7 +10,24 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import glob
+import gzip
+import hashlib
+import io
+import lzma
+import mmap
+import operator
+import pickle
+import struct
+import threading
+from array import array
+from itertools import compress, repeat
+from types import MappingProxyType
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from custom_exceptions import (
+    DataError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
@@ -33,30 +50,15 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    filename can also be a directory or glob of content packs
+    (e.g. "data/quests/*.txt", optionally .gz/.xz compressed). Packs are
+    read in parallel and an id defined in two packs is an error.
+    
+    Returns: Dictionary of quests {quest_id: Quest record}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle:
-    # - FileNotFoundError → raise MissingDataFileError
-    # - Invalid format → raise InvalidDataFormatError
-    # - Corrupted/unreadable data → raise CorruptedDataError
     create_default_data_files()  # ensure default file exists
-    quests = {}
-    try:
-        with open(filename, "r") as f:
-            content = f.read().strip()
-            if not content:
-                raise InvalidDataFormatError("Quest file is empty.")
-            blocks = content.split("\n\n")
-            for block in blocks:
-                lines = block.splitlines()
-                quest = parse_quest_block(lines)
-                quests[quest["quest_id"]] = quest
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Quest file '{filename}' not found.")
-    return quests
-    pass
+    return read_catalog_file(filename, "quest")
 
 def load_items(filename="data/items.txt"):
     """
@@ -70,27 +72,72 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    filename can also be a directory or glob of content packs, as for
+    load_quests.
+    
+    Returns: Dictionary of items {item_id: Item record}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle same exceptions as load_quests
     create_default_data_files()  # ensure default file exists
-    items = {}
-    try:
-        with open(filename, "r") as f:
-            content = f.read().strip()
-            if not content:
-                raise InvalidDataFormatError("Item file is empty.")
-            blocks = content.split("\n\n")
-            for block in blocks:
-                lines = block.splitlines()
-                item = parse_item_block(lines)
-                items[item["item_id"]] = item
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Item file '{filename}' not found.")
-    return items
-    pass
+    return read_catalog_file(filename, "item")
+
+def read_catalog_file(filename, kind):
+    """
+    Read a quest or item file into a dictionary keyed by id
+    
+    Same as load_quests/load_items but without creating default files.
+    filename may also be a directory or glob of content packs (see
+    find_data_shards).
+    
+    Returns: Dictionary {id: Quest or Item record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    shards = find_data_shards(filename)
+    if shards is not None:
+        return read_catalog_shards(shards, kind)
+    return read_catalog_pack(filename, kind)
+
+def read_catalog_pack(filename, kind):
+    """
+    Read a single quest or item file into a dictionary keyed by id
+    
+    filename is always taken literally, so pack names containing glob
+    characters (e.g. "eu[1].txt") are read as-is.
+    
+    Returns: Dictionary {id: Quest or Item record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    key_field, label = catalog_kind_info(kind)
+    records_iter = iter_quests(filename) if kind == "quest" else iter_items(filename)
+    records = {}
+    for record in records_iter:
+        records[record[key_field]] = record
+    if not records:
+        raise InvalidDataFormatError(f"{label} file is empty.")
+    return records
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yield parsed quests from a file one block at a time
+    
+    Reads the file line by line, so only the current block is held in
+    memory no matter how large the file is.
+    
+    Yields: Quest records in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for line_number, lines in iter_blocks(filename, "Quest"):
+        yield parse_quest_record(lines)
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yield parsed items from a file one block at a time
+    
+    Yields: Item records in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for line_number, lines in iter_blocks(filename, "Item"):
+        yield parse_item_record(lines)
 
 def validate_quest_data(quest_dict):
     """
@@ -209,10 +256,1300 @@ def create_default_data_files():
         raise CorruptedDataError(f"Could not create default data files: {error}")
     pass
 
+# ============================================================================
+# CATALOG RECORDS
+# ============================================================================
+
+class CatalogRecord(Mapping):
+    """
+    Base for compact, read-only quest/item records
+    
+    Fields live in __slots__ instead of a per-record dict, but records still
+    behave like the old dictionaries (record["field"], .get, in, .items()),
+    so existing callers keep working.
+    """
+    __slots__ = ("extra",)
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self.FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __getstate__(self):
+        return [getattr(self, name) for name in type(self).__slots__] + [self.extra]
+
+    def __setstate__(self, state):
+        for name, value in zip(type(self).__slots__ + ("extra",), state):
+            object.__setattr__(self, name, value)
+
+class Quest(CatalogRecord):
+    """Quest record produced by the quest loaders"""
+    __slots__ = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite")
+    FIELDS = __slots__
+
+    def __init__(self, quest_dict):
+        """Build from a validated quest dictionary (see parse_quest_block)"""
+        for name in self.FIELDS:
+            setattr(self, name, quest_dict[name])
+        extra = {k: v for k, v in quest_dict.items() if k not in self.FIELDS}
+        self.extra = extra or None
+
+class Item(CatalogRecord):
+    """
+    Item record produced by the item loaders
+    
+    The "stat:value" effect is split once at load time into stat and value.
+    item["effect"] still returns the "stat:value" string.
+    """
+    __slots__ = ("item_id", "name", "type", "stat", "value", "cost", "description")
+    FIELDS = ("item_id", "name", "type", "effect", "cost", "description")
+
+    def __init__(self, item_dict):
+        """
+        Build from a validated item dictionary (see parse_item_block)
+        
+        Raises: InvalidDataFormatError if the effect value isn't an integer
+        """
+        for name in ("item_id", "name", "type", "cost", "description"):
+            setattr(self, name, item_dict[name])
+        self.stat, self.value = split_effect(item_dict["effect"])
+        extra = {k: v for k, v in item_dict.items() if k not in self.FIELDS}
+        self.extra = extra or None
+
+    @property
+    def effect(self):
+        return f"{self.stat}:{self.value}"
+
+    @property
+    def effect_pair(self):
+        """Pre-parsed effect as (stat_name, value)"""
+        return self.stat, self.value
+
+# ============================================================================
+# CATALOG CACHE
+# ============================================================================
+
+# Bump this whenever the parsed quest/item layout changes
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"
+
+def load_quests_cached(filename="data/quests.txt"):
+    """
+    Load quests, reusing a binary cache of the parsed file when possible
+    
+    Returns: Dictionary of quests {quest_id: Quest record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return load_cached_catalog(filename, load_quests)
+
+def load_items_cached(filename="data/items.txt"):
+    """
+    Load items, reusing a binary cache of the parsed file when possible
+    
+    Returns: Dictionary of items {item_id: Item record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return load_cached_catalog(filename, load_items)
+
+def load_cached_catalog(filename, loader):
+    """
+    Load a catalog from its cache file, falling back to loader on a miss
+    
+    The cache sits next to the source file ({filename}.cache) and is only
+    used when the source's path, size, mtime and content hash all match
+    the fingerprint stored with it. On a miss the file is parsed and
+    validated with loader and the cache is rewritten.
+    
+    Args:
+        filename: Path to the quest or item text file
+        loader: load_quests or load_items
+    
+    Returns: Dictionary produced by loader
+    """
+    cache_path = filename + CACHE_SUFFIX
+    if not os.path.isfile(filename):
+        # Missing file or pack directory/glob: let the loader handle it
+        return loader(filename)
+    stat = os.stat(filename)
+
+    cached = read_catalog_cache(cache_path)
+    if cached is not None:
+        path, size, mtime, digest = cached["fingerprint"]
+        if (path == os.path.abspath(filename) and size == stat.st_size
+                and mtime == stat.st_mtime_ns and digest == hash_file(filename)):
+            return cached["data"]
+
+    data = loader(filename)
+    fingerprint = (os.path.abspath(filename), stat.st_size,
+                   stat.st_mtime_ns, hash_file(filename))
+    write_catalog_cache(cache_path, fingerprint, data)
+    return data
+
+def read_catalog_cache(cache_path):
+    """
+    Read a catalog cache file
+    
+    Returns: Dictionary with 'fingerprint' and 'data', or None if the cache
+             is missing, unreadable or from another CACHE_VERSION
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        # A missing or broken cache is never fatal, just re-parse the source
+        return None
+
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+        return None
+    return cached
+
+def write_catalog_cache(cache_path, fingerprint, data):
+    """
+    Write a catalog cache file
+    
+    The cache is written to a temp file and renamed into place so readers
+    never see a half-written cache. Failures (e.g. read-only data folder)
+    are ignored since the cache is only an optimization.
+    
+    Returns: True if the cache was written, False otherwise
+    """
+    temp_path = cache_path + ".tmp"
+    payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "data": data}
+    try:
+        with open(temp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        return False
+    return True
+
+def hash_file(filename, chunk_size=1 << 20):
+    """
+    Return the SHA-256 hex digest of a file, reading it in chunks
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ============================================================================
+# INDEXED CATALOG FILES
+# ============================================================================
+
+# Image layout:
+#   header: MAGIC, record count, offset of the entry table
+#   records: one pickle per record
+#   ids: utf-8 ids back to back
+#   entry table: (id offset, id length, record offset, record length) per
+#                record in file order
+#   sorted table: entry numbers ordered by id bytes, for binary search
+CATALOG_MAGIC = b"QCCAT002"
+CATALOG_HEADER = struct.Struct("<8sQQ")
+CATALOG_ENTRY = struct.Struct("<QIQI")
+CATALOG_SLOT = struct.Struct("<I")
+
+def build_quest_catalog(filename="data/quests.txt", catalog_filename=None):
+    """
+    Convert a quest text file into an indexed catalog file
+    
+    Returns: Path of the catalog file ({filename}.cat by default)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if catalog_filename is None:
+        catalog_filename = filename + ".cat"
+    write_indexed_catalog(iter_quests(filename), "quest_id", catalog_filename)
+    return catalog_filename
+
+def build_item_catalog(filename="data/items.txt", catalog_filename=None):
+    """
+    Convert an item text file into an indexed catalog file
+    
+    Returns: Path of the catalog file ({filename}.cat by default)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if catalog_filename is None:
+        catalog_filename = filename + ".cat"
+    write_indexed_catalog(iter_items(filename), "item_id", catalog_filename)
+    return catalog_filename
+
+def write_indexed_catalog(records, key_field, catalog_filename):
+    """
+    Write records to an indexed catalog file
+    
+    Args:
+        records: Iterable of validated quest or item records
+        key_field: "quest_id" or "item_id"
+        catalog_filename: Path to write
+    """
+    temp_path = catalog_filename + ".tmp"
+    with open(temp_path, "wb") as f:
+        encode_catalog_image(records, key_field, f)
+    os.replace(temp_path, catalog_filename)
+
+def encode_catalog_image(records, key_field, stream):
+    """
+    Write records to a seekable binary stream in the catalog image layout
+    
+    Each record is pickled on its own so it can be decoded without touching
+    the rest of the image. Ids are found by binary search over the sorted
+    table, so readers never build an index of their own.
+    
+    Args:
+        records: Iterable of validated quest or item records
+        key_field: "quest_id" or "item_id"
+        stream: Binary file or io.BytesIO positioned at its start
+    """
+    stream.write(CATALOG_HEADER.pack(CATALOG_MAGIC, 0, 0))
+    spans = {}  # id bytes → (record offset, record length); last one wins
+    for record in records:
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        spans[record[key_field].encode("utf-8")] = (stream.tell(), len(data))
+        stream.write(data)
+
+    entries = []
+    for key, (offset, length) in spans.items():
+        entries.append((stream.tell(), len(key), offset, length))
+        stream.write(key)
+
+    table_offset = stream.tell()
+    for entry in entries:
+        stream.write(CATALOG_ENTRY.pack(*entry))
+    keys = list(spans)
+    for slot in sorted(range(len(keys)), key=keys.__getitem__):
+        stream.write(CATALOG_SLOT.pack(slot))
+
+    end = stream.tell()
+    stream.seek(0)
+    stream.write(CATALOG_HEADER.pack(CATALOG_MAGIC, len(entries), table_offset))
+    stream.seek(end)
+
+class CatalogImage(Mapping):
+    """
+    Read-only {id: record} mapping over a buffer in the catalog image layout
+    
+    Nothing but the buffer is kept in memory: ids are found by binary
+    search and each record is decoded when it is looked up. Can be passed
+    anywhere quest_handler/inventory_system expect a data dictionary.
+    """
+    def open_image(self, buffer, source):
+        """
+        Check the header of buffer and start reading from it
+        
+        Raises: CorruptedDataError if buffer isn't a catalog image
+        """
+        self._buf = buffer
+        try:
+            magic, self._count, self._table = CATALOG_HEADER.unpack_from(buffer, 0)
+        except struct.error:
+            magic = None
+        if magic != CATALOG_MAGIC or self._table == 0:
+            raise CorruptedDataError(f"'{source}' is not a catalog image.")
+        self._slots = self._table + self._count * CATALOG_ENTRY.size
+
+    def entry(self, number):
+        """Return (id offset, id length, record offset, record length)"""
+        return CATALOG_ENTRY.unpack_from(self._buf, self._table + number * CATALOG_ENTRY.size)
+
+    def entry_key(self, number):
+        """Return the id bytes of an entry"""
+        id_offset, id_length, offset, length = self.entry(number)
+        return bytes(self._buf[id_offset:id_offset + id_length])
+
+    def find(self, key):
+        """
+        Binary search the sorted table for key
+        
+        Returns: Entry number, or None if key isn't in the catalog
+        """
+        if not isinstance(key, str):
+            return None
+        target = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            number = CATALOG_SLOT.unpack_from(self._buf, self._slots + middle * CATALOG_SLOT.size)[0]
+            found = self.entry_key(number)
+            if found == target:
+                return number
+            if found < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __getitem__(self, key):
+        number = self.find(key)
+        if number is None:
+            raise KeyError(key)
+        id_offset, id_length, offset, length = self.entry(number)
+        return pickle.loads(self._buf[offset:offset + length])
+
+    def __iter__(self):
+        for number in range(self._count):
+            yield self.entry_key(number).decode("utf-8")
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class IndexedCatalog(CatalogImage):
+    """
+    Catalog image read from a memory-mapped file
+    
+    Memory use follows the records that are looked up, not the file size.
+    """
+    def __init__(self, catalog_filename):
+        """Open and map a catalog written by write_indexed_catalog"""
+        self._map = None
+        try:
+            self._file = open(catalog_filename, "rb")
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Catalog file '{catalog_filename}' not found.")
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.open_image(self._map, catalog_filename)
+        except CorruptedDataError:
+            self.close()
+            raise
+        except Exception as e:
+            self.close()
+            raise CorruptedDataError(f"Could not read catalog '{catalog_filename}': {e}")
+
+    def close(self):
+        """Unmap and close the catalog file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+# ============================================================================
+# SHARED MEMORY CATALOGS
+# ============================================================================
+
+def publish_catalog(catalog, kind):
+    """
+    Copy a loaded catalog into a new shared memory block
+    
+    Worker processes can then open it by name with SharedCatalog instead of
+    re-loading the data files or receiving a pickled copy.
+    
+    Args:
+        catalog: Mapping {id: record}, e.g. from load_quests/load_items
+        kind: "quest" or "item"
+    
+    Returns: SharedCatalog owning the block. Pass its .name to workers and
+             call unlink() when every worker is done with it.
+    """
+    key_field = catalog_kind_info(kind)[0]
+    image = io.BytesIO()
+    encode_catalog_image(catalog.values(), key_field, image)
+
+    size = image.tell()
+    block = shared_memory.SharedMemory(create=True, size=size)
+    block.buf[:size] = image.getbuffer()
+    return SharedCatalog(block.name, block=block)
+
+class SharedCatalog(CatalogImage):
+    """
+    Catalog image read directly out of multiprocessing shared memory
+    
+    Every process that attaches maps the same pages, so attaching costs
+    the same no matter how big the catalog is.
+    """
+    def __init__(self, name, block=None):
+        """
+        Attach to a block created by publish_catalog
+        
+        Args:
+            name: SharedCatalog.name from the publishing process
+            block: Only used by publish_catalog for the owning process
+        
+        Raises: MissingDataFileError if no block has that name
+        """
+        self.owner = block is not None
+        if block is None:
+            try:
+                block = attach_shared_memory(name)
+            except FileNotFoundError:
+                raise MissingDataFileError(f"Shared catalog '{name}' not found.")
+        self.block = block
+        self.name = block.name
+        self.open_image(block.buf, name)
+
+    def close(self):
+        """Detach from the block (the block itself stays alive)"""
+        if self.block is not None:
+            self._buf = None
+            self.block.close()
+            self.block = None
+
+    def unlink(self):
+        """Detach and destroy the block; only the publishing process should call this"""
+        block = self.block
+        self.close()
+        if block is not None:
+            block.unlink()
+
+def attach_shared_memory(name):
+    """
+    Open an existing shared memory block without taking ownership of it
+    
+    Python 3.13+ can skip resource tracking for attached blocks. On older
+    versions the block is tracked by the resource tracker that
+    multiprocessing children share with their parent, so it is still only
+    unlinked by the publisher (or when that whole process family exits).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+# ============================================================================
+# PARALLEL LOADING
+# ============================================================================
+
+def load_quests_parallel(filename="data/quests.txt", workers=None):
+    """
+    Load quests by parsing chunks of the file in a process pool
+    
+    Same result and exceptions as load_quests, but worth it only for very
+    large files since each worker has to be started and fed.
+    
+    Args:
+        filename: Quest file to load
+        workers: Number of processes (defaults to os.cpu_count())
+    
+    Returns: Dictionary of quests {quest_id: Quest record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return load_catalog_parallel(filename, "quest", workers)
+
+def load_items_parallel(filename="data/items.txt", workers=None):
+    """
+    Load items by parsing chunks of the file in a process pool
+    
+    Returns: Dictionary of items {item_id: Item record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return load_catalog_parallel(filename, "item", workers)
+
+def load_catalog_parallel(filename, kind, workers=None):
+    """
+    Split a data file at blank lines and parse the pieces in parallel
+    
+    Chunks are merged in file order, so the result (including which record
+    wins for a duplicate id) is the same as a serial load. If any block is
+    bad, the error for the earliest bad block in the file is raised.
+    
+    Args:
+        filename: Quest or item file
+        kind: "quest" or "item"
+        workers: Number of processes (defaults to os.cpu_count())
+    
+    Raises: InvalidDataFormatError for .gz/.xz files (use load_quests/load_items)
+    """
+    create_default_data_files()
+    key_field, label = catalog_kind_info(kind)
+    workers = workers or os.cpu_count() or 1
+    if filename.endswith((".gz", ".xz")):
+        # Byte ranges of a compressed file aren't blocks of text
+        raise InvalidDataFormatError(
+            f"{label} file '{filename}' is compressed; parallel loading needs a plain text file."
+        )
+
+    try:
+        ranges = split_at_block_boundaries(filename, workers)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} file '{filename}' not found.")
+
+    records = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(parse_catalog_chunk, filename, start, end, kind)
+            for start, end in ranges
+        ]
+        for future in futures:
+            chunk_records, error = future.result()
+            if error is not None:
+                error_type, offset, message = error
+                line = count_lines_before(filename, offset)
+                raise error_type(f"{label} block at line {line}: {message}")
+            for record in chunk_records:
+                records[record[key_field]] = record
+
+    if not records:
+        raise InvalidDataFormatError(f"{label} file is empty.")
+    return records
+
+def catalog_kind_info(kind):
+    """
+    Return (id field, display label) for a catalog kind
+    
+    Raises: ValueError for anything other than "quest" or "item"
+    """
+    if kind == "quest":
+        return "quest_id", "Quest"
+    if kind == "item":
+        return "item_id", "Item"
+    raise ValueError(f"Unknown catalog kind: {kind}")
+
+def block_parser_for(kind):
+    """
+    Return parse_quest_record or parse_item_record for a catalog kind
+    """
+    return parse_quest_record if kind == "quest" else parse_item_record
+
+def split_at_block_boundaries(filename, parts):
+    """
+    Split a file into about `parts` byte ranges that end on blank lines
+    
+    Returns: List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as f:
+        for i in range(1, parts):
+            target = size * i // parts
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target)
+            f.readline()  # finish the line we landed in
+            while True:
+                line = f.readline()
+                if not line or not line.strip():
+                    break
+            if f.tell() >= size:
+                break
+            if f.tell() > boundaries[-1]:
+                boundaries.append(f.tell())
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+def parse_catalog_chunk(filename, start, end, kind):
+    """
+    Parse and validate every block in one byte range of a data file
+    
+    Runs inside a worker process, so data errors are returned instead of
+    raised to keep the failing block's byte offset.
+    
+    Returns: (list of records, None) or ([], (error type, offset, message))
+    """
+    parser = block_parser_for(kind)
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    records = []
+    block = []
+    block_offset = start
+    position = start
+    for raw_line in data.splitlines(keepends=True) + [b"\n"]:
+        try:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+        except UnicodeDecodeError as e:
+            # Same error the serial loader raises for undecodable text
+            return [], (CorruptedDataError, position, f"file is unreadable: {e}")
+        if line.strip():
+            if not block:
+                block_offset = position
+            block.append(line)
+        elif block:
+            try:
+                records.append(parser(block))
+            except DataError as e:
+                return [], (type(e), block_offset, str(e))
+            block = []
+        position += len(raw_line)
+    return records, None
+
+def count_lines_before(filename, offset):
+    """
+    Return the 1-based line number containing byte `offset` of a file
+    
+    For .gz/.xz files offset is a position in the decompressed text, the
+    same as the offsets iter_raw_blocks yields.
+    """
+    lines = 1
+    with open_data_file(filename, "rb") as f:
+        while offset > 0:
+            chunk = f.read(min(offset, 1 << 20))
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            offset -= len(chunk)
+    return lines
+
+# ============================================================================
+# LAZY CATALOG
+# ============================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only {id: record} mapping that parses blocks on first access
+    
+    Opening the catalog only scans the file for block offsets and ids.
+    A block is parsed and validated the first time it is read, and the
+    result is kept in self.parsed for later lookups. Compressed files work,
+    but each first lookup decompresses the file up to its block.
+    """
+    def __init__(self, filename, kind="quest"):
+        """
+        Scan a quest or item file for its blocks
+        
+        Raises: MissingDataFileError, InvalidDataFormatError if a block has
+                no id line or the file is empty
+        """
+        self.filename = filename
+        self.kind = kind
+        self.parsed = {}
+        key_field, self.label = catalog_kind_info(kind)
+        id_prefix = key_field.upper().encode() + b":"
+
+        self._spans = {}
+        for offset, raw in iter_raw_blocks(filename, self.label):
+            key = extract_block_id(raw, id_prefix)
+            if key is None:
+                line = count_lines_before(filename, offset)
+                raise InvalidDataFormatError(
+                    f"{self.label} block at line {line} is missing {key_field.upper()}."
+                )
+            self._spans[key] = (offset, len(raw))
+        if not self._spans:
+            raise InvalidDataFormatError(f"{self.label} file is empty.")
+
+    def __getitem__(self, key):
+        if key in self.parsed:
+            return self.parsed[key]
+
+        offset, length = self._spans[key]
+        with open_data_file(self.filename, "rb") as f:
+            f.seek(offset)
+            raw = f.read(length)
+        lines = decode_raw_block(raw, self.filename, offset, self.label)
+        try:
+            record = block_parser_for(self.kind)(lines)
+        except DataError as e:
+            line = count_lines_before(self.filename, offset)
+            raise type(e)(f"{self.label} block at line {line}: {e}")
+
+        self.parsed[key] = record
+        return record
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __contains__(self, key):
+        return key in self._spans
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class CatalogReloader:
+    """
+    Incrementally reloads a quest or item file into an existing dictionary
+    
+    Keeps a hash of every block. On reload() the file is re-scanned and
+    hashed, but only blocks whose hash changed are parsed, so the parsing
+    cost follows the size of the edit rather than the size of the file.
+    """
+    def __init__(self, filename, kind, catalog):
+        """
+        Args:
+            filename: Quest or item file that catalog was loaded from
+            kind: "quest" or "item"
+            catalog: Dictionary to keep up to date (e.g. main.all_quests)
+        """
+        self.filename = filename
+        self.kind = kind
+        self.catalog = catalog
+        key_field, self.label = catalog_kind_info(kind)
+        self.id_prefix = key_field.upper().encode() + b":"
+        self.block_hashes = {
+            key: digest for key, digest, offset, raw in self.scan()
+        }
+
+    def scan(self):
+        """
+        Yield (id, hash, offset, raw bytes) for each block in the file
+        """
+        for offset, raw in iter_raw_blocks(self.filename, self.label):
+            key = extract_block_id(raw, self.id_prefix)
+            if key is None:
+                line = count_lines_before(self.filename, offset)
+                raise InvalidDataFormatError(
+                    f"{self.label} block at line {line} has no id."
+                )
+            yield key, hashlib.sha1(raw).digest(), offset, raw
+
+    def reload(self):
+        """
+        Apply file changes to the catalog dictionary in place
+        
+        All changed blocks are parsed before anything is modified, so a bad
+        edit leaves the catalog and the stored hashes untouched.
+        
+        Returns: Dictionary with 'added', 'updated' and 'removed' id lists
+        Raises: InvalidDataFormatError, CorruptedDataError for a bad block
+        """
+        parser = block_parser_for(self.kind)
+        new_hashes = {}
+        changed = {}
+        for key, digest, offset, raw in self.scan():
+            new_hashes[key] = digest
+            if self.block_hashes.get(key) == digest and key in self.catalog:
+                continue
+            lines = decode_raw_block(raw, self.filename, offset, self.label)
+            try:
+                changed[key] = parser(lines)
+            except DataError as e:
+                line = count_lines_before(self.filename, offset)
+                raise type(e)(f"{self.label} block at line {line}: {e}")
+
+        diff = {"added": [], "updated": [], "removed": []}
+        for key in self.block_hashes:
+            if key not in new_hashes:
+                self.catalog.pop(key, None)
+                diff["removed"].append(key)
+        for key, record in changed.items():
+            diff["updated" if key in self.catalog else "added"].append(key)
+            self.catalog[key] = record
+
+        self.block_hashes = new_hashes
+        return diff
+
+# ============================================================================
+# COLUMNAR ITEM CATALOG
+# ============================================================================
+
+ITEM_TYPES = ("weapon", "armor", "consumable")
+
+class ItemColumns:
+    """
+    Item catalog stored as parallel typed arrays, one per field
+    
+    Columns: item_ids (list), cost, type_code, stat_code, effect_value
+    (array.array). Queries combine whole columns with map/compress instead
+    of walking one item dictionary at a time, which keeps them fast and
+    small for very large catalogs.
+    """
+    def __init__(self):
+        """Create an empty catalog; use from_items/from_file to fill it"""
+        self.item_ids = []
+        self.cost = array("q")
+        self.type_code = array("b")
+        self.stat_code = array("b")
+        self.effect_value = array("q")
+        self.stats = []  # stat_code → stat name
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Build columns from records, e.g. the result of load_items
+        
+        Args:
+            items: Iterable of Item records or item dictionaries
+        """
+        columns = cls()
+        for item in items:
+            columns.append(item)
+        return columns
+
+    @classmethod
+    def from_file(cls, filename="data/items.txt"):
+        """Build columns straight from an item file without a dict in between"""
+        return cls.from_items(iter_items(filename))
+
+    def append(self, item):
+        """
+        Add one item to the end of every column
+        
+        Raises: InvalidDataFormatError for an unknown type or bad effect
+        """
+        if item["type"] not in ITEM_TYPES:
+            raise InvalidDataFormatError(f"Invalid item type: {item['type']}")
+        stat, value = getattr(item, "effect_pair", None) or split_effect(item["effect"])
+        if stat not in self.stats:
+            self.stats.append(stat)
+
+        self.item_ids.append(item["item_id"])
+        self.cost.append(item["cost"])
+        self.type_code.append(ITEM_TYPES.index(item["type"]))
+        self.stat_code.append(self.stats.index(stat))
+        self.effect_value.append(value)
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    def type_mask(self, item_type):
+        """Return a list of booleans, True where the item has item_type"""
+        code = ITEM_TYPES.index(item_type)
+        return list(map(operator.eq, self.type_code, repeat(code)))
+
+    def stat_mask(self, stat):
+        """Return a list of booleans, True where the item's effect targets stat"""
+        if stat not in self.stats:
+            return [False] * len(self)
+        return list(map(operator.eq, self.stat_code, repeat(self.stats.index(stat))))
+
+    def affordable_mask(self, gold):
+        """Return a list of booleans, True where cost <= gold"""
+        return list(map(operator.le, self.cost, repeat(gold)))
+
+    def select(self, *masks):
+        """
+        Combine masks with AND
+        
+        Returns: List of row indexes where every mask is True
+        """
+        if not masks:
+            return list(range(len(self)))
+        combined = masks[0]
+        for mask in masks[1:]:
+            combined = map(operator.and_, combined, mask)
+        return list(compress(range(len(self)), combined))
+
+    def affordable(self, gold, item_type=None, stat=None):
+        """
+        Get ids of items costing at most gold, optionally filtered
+        
+        Returns: List of item ids in catalog order
+        """
+        masks = [self.affordable_mask(gold)]
+        if item_type is not None:
+            masks.append(self.type_mask(item_type))
+        if stat is not None:
+            masks.append(self.stat_mask(stat))
+        return [self.item_ids[i] for i in self.select(*masks)]
+
+    def best_value(self, item_type, gold, stat=None, limit=None):
+        """
+        Rank affordable items of a type by effect value per gold
+        
+        Free items rank first. Ties keep catalog order.
+        
+        Returns: List of (item_id, value_per_gold) pairs, best first
+        """
+        masks = [self.affordable_mask(gold), self.type_mask(item_type)]
+        if stat is not None:
+            masks.append(self.stat_mask(stat))
+        rows = self.select(*masks)
+
+        cost = self.cost
+        value = self.effect_value
+        ratios = [value[i] / cost[i] if cost[i] else float("inf") for i in rows]
+        order = sorted(range(len(rows)), key=ratios.__getitem__, reverse=True)
+        if limit is not None:
+            order = order[:limit]
+        return [(self.item_ids[rows[k]], ratios[k]) for k in order]
+
+# ============================================================================
+# CATALOG VALIDATION REPORT
+# ============================================================================
+
+def validate_quest_file(filename="data/quests.txt", max_errors=1000):
+    """
+    Check a whole quest file in one pass and report every problem
+    
+    Returns: Report dictionary (see validate_catalog_file)
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    return validate_catalog_file(filename, "quest", max_errors)
+
+def validate_item_file(filename="data/items.txt", max_errors=1000):
+    """
+    Check a whole item file in one pass and report every problem
+    
+    Returns: Report dictionary (see validate_catalog_file)
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    return validate_catalog_file(filename, "item", max_errors)
+
+def validate_catalog_file(filename, kind, max_errors=1000):
+    """
+    Validate every block of a quest or item file without stopping
+    
+    The file is read once, block by block. Only the ids seen so far and
+    the quest prerequisites that pointed forward are kept; those forward
+    references are resolved after the last block. Prerequisites are
+    checked the same way as quest_handler.validate_quest_prerequisites.
+    
+    Args:
+        filename: Quest or item file
+        kind: "quest" or "item"
+        max_errors: Keep details for only the first this many errors by
+                    line (the rest are still counted in error_count)
+    
+    Returns: Dictionary with:
+        - file, kind
+        - records: number of blocks that parsed and validated
+        - error_count: total number of problems found
+        - errors: list of {'line', 'id', 'message'} dictionaries
+        - valid: True if no problems were found
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    key_field, label = catalog_kind_info(kind)
+    parser = block_parser_for(kind)
+    report = {"file": filename, "kind": kind, "records": 0,
+              "error_count": 0, "errors": [], "valid": True}
+
+    def add_error(line, record_id, message):
+        report["error_count"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line, "id": record_id, "message": message})
+
+    seen = set()
+    pending = []  # (line, quest_id, prerequisite) not yet seen
+
+    for start, lines in iter_blocks(filename, label):
+        record_id = block_field(lines, key_field)
+        bad_line = next((n for n, line in enumerate(lines) if ": " not in line), None)
+        if bad_line is not None:
+            add_error(start + bad_line, record_id,
+                      f"Invalid {label.lower()} line format: {lines[bad_line].strip()}")
+            continue
+
+        try:
+            record = parser(lines)
+        except DataError as e:
+            add_error(start, record_id, str(e))
+            continue
+
+        record_id = record[key_field]
+        if record_id in seen:
+            add_error(start, record_id, f"Duplicate {key_field}: {record_id}")
+            continue
+        seen.add(record_id)
+        report["records"] += 1
+
+        if kind == "quest":
+            prereq = record["prerequisite"]
+            if prereq != "NONE" and prereq not in seen:
+                pending.append((start, record_id, prereq))
+
+    # Block errors arrive in line order, so the ones dropped above all come
+    # after those kept. Prerequisite errors can point anywhere, so they are
+    # all kept until the final sort and cut.
+    for line, record_id, prereq in pending:
+        if prereq not in seen:
+            report["error_count"] += 1
+            report["errors"].append({
+                "line": line, "id": record_id,
+                "message": f"Quest '{record_id}' has an invalid prerequisite '{prereq}'."
+            })
+
+    if report["records"] == 0 and report["error_count"] == 0:
+        add_error(1, None, f"{label} file is empty.")
+    report["errors"].sort(key=lambda error: error["line"])
+    del report["errors"][max_errors:]
+    report["valid"] = report["error_count"] == 0
+    return report
+
+# ============================================================================
+# CATALOG REPOSITORY
+# ============================================================================
+
+class CatalogRepository:
+    """
+    Process-wide store of loaded quest and item catalogs
+    
+    Each data file is read at most once until it is invalidated, and every
+    caller gets the same read-only view of it. Callers that are done with
+    a catalog can release() it to keep the holder count accurate; the
+    catalog itself stays loaded until invalidate().
+    Default data files are created only on the first load.
+    """
+    def __init__(self):
+        """Create an empty repository"""
+        self.catalogs = {}   # (path, kind) → read-only view
+        self.refcounts = {}  # (path, kind) → number of holders
+        self.defaults_created = False
+        self.lock = threading.Lock()
+
+    def get(self, filename, kind):
+        """
+        Get a shared read-only view of a catalog, loading it if needed
+        
+        Each call counts as one holder until release() is called.
+        
+        Args:
+            filename: Quest or item file
+            kind: "quest" or "item"
+        
+        Returns: Read-only mapping {id: record}
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        key = (os.path.abspath(filename), kind)
+        with self.lock:
+            if key not in self.catalogs:
+                if not self.defaults_created:
+                    create_default_data_files()
+                    self.defaults_created = True
+                self.catalogs[key] = MappingProxyType(read_catalog_file(filename, kind))
+                self.refcounts[key] = 0
+            self.refcounts[key] += 1
+            return self.catalogs[key]
+
+    def get_quests(self, filename="data/quests.txt"):
+        """Shared read-only view of a quest file (see get)"""
+        return self.get(filename, "quest")
+
+    def get_items(self, filename="data/items.txt"):
+        """Shared read-only view of an item file (see get)"""
+        return self.get(filename, "item")
+
+    def release(self, filename, kind, view):
+        """
+        Give back a view obtained from get()
+        
+        The catalog stays loaded until invalidate(); releasing only drops
+        the holder count. A view handed out before the last invalidate()
+        belongs to an older generation and doesn't count against the
+        current one.
+        
+        Args:
+            filename: Quest or item file passed to get()
+            kind: "quest" or "item"
+            view: The mapping get() returned
+        
+        Returns: Number of holders left on the current catalog
+        """
+        key = (os.path.abspath(filename), kind)
+        with self.lock:
+            if self.catalogs.get(key) is not view:
+                return self.refcounts.get(key, 0)
+            self.refcounts[key] = max(self.refcounts[key] - 1, 0)
+            return self.refcounts[key]
+
+    def invalidate(self, filename=None):
+        """
+        Forget loaded catalogs so the next get() re-reads the file
+        
+        Views already handed out keep their old data.
+        
+        Args:
+            filename: File to forget, or None to forget everything
+        """
+        with self.lock:
+            if filename is None:
+                self.catalogs.clear()
+                self.refcounts.clear()
+                return
+            path = os.path.abspath(filename)
+            for key in [key for key in self.catalogs if key[0] == path]:
+                del self.catalogs[key]
+                del self.refcounts[key]
+
+# Shared instance used by the whole process
+REPOSITORY = CatalogRepository()
+
+# ============================================================================
+# CONTENT PACKS
+# ============================================================================
+
+SHARD_SUFFIXES = (".txt", ".gz", ".xz")
+
+def find_data_shards(pattern):
+    """
+    Expand a directory or glob into the content pack files it names
+    
+    A directory means every *.txt, *.gz and *.xz file directly inside it.
+    Files are returned sorted so the merge order never depends on the
+    order the filesystem lists them in.
+    
+    Returns: Sorted list of paths, or None if pattern is an existing file or
+             a plain file path
+    Raises: MissingDataFileError if the directory/glob matches no files
+    """
+    if os.path.isfile(pattern):
+        return None  # an existing file is read as-is, even with glob characters
+    if os.path.isdir(pattern):
+        paths = [
+            os.path.join(pattern, name) for name in os.listdir(pattern)
+            if name.endswith(SHARD_SUFFIXES)
+        ]
+    elif any(char in pattern for char in "*?["):
+        paths = [path for path in glob.glob(pattern) if os.path.isfile(path)]
+    else:
+        return None
+
+    if not paths:
+        raise MissingDataFileError(f"No data files found for '{pattern}'.")
+    return sorted(paths)
+
+def read_catalog_shards(paths, kind, workers=None):
+    """
+    Read several content packs concurrently and merge them
+    
+    Each pack is read and parsed in a thread pool (decompression and file
+    reads release the GIL). Results are merged in the order of paths.
+    
+    Args:
+        paths: Pack files, in merge order
+        kind: "quest" or "item"
+        workers: Number of threads (defaults to one per pack, at most 8)
+    
+    Returns: Dictionary {id: record}
+    Raises: InvalidDataFormatError if an id appears in more than one pack,
+            plus anything read_catalog_pack raises for a single pack
+    """
+    key_field, label = catalog_kind_info(kind)
+    workers = workers or min(len(paths), 8)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(lambda path: read_catalog_pack(path, kind), paths))
+
+    records = {}
+    origin = {}
+    for path, shard in zip(paths, shards):
+        for key, record in shard.items():
+            if key in records:
+                raise InvalidDataFormatError(
+                    f"Duplicate {key_field} '{key}' in '{origin[key]}' and '{path}'."
+                )
+            records[key] = record
+            origin[key] = path
+    return records
+
+def open_data_file(filename, mode="r"):
+    """
+    Open a data file, decompressing .gz and .xz files transparently
+    
+    Args:
+        mode: "r" for text or "rb" for bytes
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode if mode == "rb" else "rt")
+    if filename.endswith(".xz"):
+        return lzma.open(filename, mode if mode == "rb" else "rt")
+    return open(filename, mode)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def iter_blocks(filename, label="Data"):
+    """
+    Yield the blank-line separated blocks of a data file
+    
+    Args:
+        filename: Path to the data file
+        label: Name used in error messages (e.g. "Quest", "Item")
+    
+    Yields: Tuples of (line number of the block's first line, list of lines)
+    Raises: MissingDataFileError if the file doesn't exist
+            CorruptedDataError if the file can't be read
+    """
+    try:
+        f = open_data_file(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} file '{filename}' not found.")
+    except OSError as e:
+        raise CorruptedDataError(f"Could not read {label.lower()} file '{filename}': {e}")
+
+    with f:
+        block = []
+        start = 0
+        try:
+            for line_number, line in enumerate(f, start=1):
+                line = line.rstrip("\n")
+                if line.strip():
+                    if not block:
+                        start = line_number
+                    block.append(line)
+                elif block:
+                    yield start, block
+                    block = []
+        except (UnicodeDecodeError, OSError, EOFError, lzma.LZMAError) as e:
+            raise CorruptedDataError(f"{label} file '{filename}' is unreadable: {e}")
+        if block:
+            yield start, block
+
+def iter_raw_blocks(filename, label="Data"):
+    """
+    Yield the raw bytes of each blank-line separated block of a data file
+    
+    Unlike iter_blocks nothing is decoded, which keeps scans that only need
+    offsets, ids or hashes cheap.
+    
+    Yields: Tuples of (byte offset of the block, block bytes)
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    try:
+        f = open_data_file(filename, "rb")
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} file '{filename}' not found.")
+
+    with f:
+        block = []
+        start = 0
+        position = 0
+        for line in f:
+            if line.strip():
+                if not block:
+                    start = position
+                block.append(line)
+            elif block:
+                yield start, b"".join(block)
+                block = []
+            position += len(line)
+        if block:
+            yield start, b"".join(block)
+
+def decode_raw_block(raw_block, filename, offset, label="Data"):
+    """
+    Decode a block from iter_raw_blocks into lines
+    
+    Returns: List of lines
+    Raises: CorruptedDataError if the block isn't valid UTF-8 (the same
+            error the serial loader raises)
+    """
+    try:
+        return raw_block.decode("utf-8").splitlines()
+    except UnicodeDecodeError as e:
+        line = count_lines_before(filename, offset)
+        raise CorruptedDataError(f"{label} block at line {line} is unreadable: {e}")
+
+def extract_block_id(raw_block, id_prefix):
+    """
+    Find the id in a raw block (e.g. b"QUEST_ID: first_steps")
+    
+    Returns: The id as a string, or None if the block has no id line
+    """
+    for line in raw_block.splitlines():
+        key, sep, value = line.partition(b":")
+        if sep and key.strip().upper() + b":" == id_prefix:
+            return value.strip().decode("utf-8", errors="replace")
+    return None
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -303,6 +1640,50 @@ def parse_item_block(lines):
         raise CorruptedDataError(f"Error parsing item block: {e}")
     pass
 
+def block_field(lines, field):
+    """
+    Get the raw value of one field from a block's lines without parsing it
+    
+    Returns: The value string, or None if the field isn't present
+    """
+    prefix = field.upper()
+    for line in lines:
+        key, sep, value = line.partition(":")
+        if sep and key.strip().upper() == prefix:
+            return value.strip()
+    return None
+
+def split_effect(effect):
+    """
+    Split an item effect string into (stat_name, value)
+    
+    Example: "health:20" → ("health", 20)
+    Raises: InvalidDataFormatError if the effect is malformed
+    """
+    stat, sep, value = effect.partition(":")
+    try:
+        if not sep:
+            raise ValueError
+        return stat.strip(), int(value)
+    except ValueError:
+        raise InvalidDataFormatError(f"Invalid effect format (expected stat:value): {effect}")
+
+def parse_quest_record(lines):
+    """
+    Parse a block of lines into a compact Quest record
+    
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return Quest(parse_quest_block(lines))
+
+def parse_item_record(lines):
+    """
+    Parse a block of lines into a compact Item record
+    
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return Item(parse_item_block(lines))
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -9,6 +9,7 @@ AI Usage: [Mainly used for fromatting, debugging, and understanding]
 This module handles inventory management, item usage, and equipment.
 """
 
+from functools import lru_cache
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -183,14 +184,12 @@ def use_item(character, item_id, item_data):
     if item_type != "consumable":
         raise InvalidItemTypeError(f"Item '{item_id}' is not a consumable item.")
 
-    # Parse effect string (format: "stat:value")
-    effect_str = item_data.get("effect", "")
-    if ":" not in effect_str:
+    # Get effect (pre-parsed on game_data.Item records, else "stat:value")
+    try:
+        stat_name, value = get_item_effect(item_data)
+    except ValueError:
         raise InvalidItemTypeError(f"Invalid effect format for item '{item_id}'.")
 
-    stat_name, value_str = effect_str.split(":")
-    value = int(value_str)
-
     # Apply effect to character
     # Assumes character[stat_name] exists
     character[stat_name] = character.get(stat_name, 0) + value
@@ -244,28 +243,27 @@ def equip_weapon(character, item_id, item_data):
 
     if old_weapon:
         # Remove old weapon's stat bonus
-        old_effect = character.get("equipped_weapon_effect", "")
-        if old_effect and ":" in old_effect:
-            stat, value_str = old_effect.split(":")
-            character[stat] -= int(value_str)
+        old_effect = character.get("equipped_weapon_effect")
+        if old_effect:
+            stat, value = old_effect
+            character[stat] -= value
 
         # Add old weapon back to inventory
         character["inventory"].append(old_weapon)
         message_parts.append(f"Unequipped {old_weapon}")
 
-    # Parse new weapon effect
-    effect = item_data.get("effect", "")
-    if not effect or ":" not in effect:
+    # Get new weapon effect
+    try:
+        stat, value = get_item_effect(item_data)
+    except ValueError:
         raise InvalidItemTypeError(f"Invalid effect format for weapon '{item_id}'.")
 
-    stat, value_str = effect.split(":")
-    value = int(value_str)
-
     # Apply new weapon stat bonus
     character[stat] = character.get(stat, 0) + value
 
-    # Equip weapon
+    # Equip weapon (remember its bonus so it can be removed later)
     character["equipped_weapon"] = item_id
+    character["equipped_weapon_effect"] = (stat, value)
 
     # Remove weapon from inventory
     character["inventory"].remove(item_id)
@@ -306,37 +304,35 @@ def equip_armor(character, item_id, item_data):
     if item_type != "armor":
         raise InvalidItemTypeError(f"Item '{item_id}' is not armor.")
 
-    # Handle unequipping current weapon
+    # Handle unequipping current armor
+    old_armor = character.get("equipped_armor")
     message_parts = []
-    if old_weapon:
-            old_effect = item_data[old_weapon].get("effect", "")
-
-    if old_weapon:
-        # Parse old weapon effect and remove it
-        old_effect = item_data[old_weapon].get("effect", "")
-        if ":" in old_effect:
-            stat, value_str = old_effect.split(":")
-            character[stat] -= int(value_str)
 
-        # Add old weapon back to inventory
-        character["inventory"].append(old_weapon)
-        message_parts.append(f"Unequipped {old_weapon}")
+    if old_armor:
+        # Remove old armor's stat bonus
+        old_effect = character.get("equipped_armor_effect")
+        if old_effect:
+            stat, value = old_effect
+            character[stat] -= value
 
-    # Parse new weapon effect
-    effect = item_data.get("effect", "")
-    if ":" not in effect:
-        raise InvalidItemTypeError(f"Invalid effect format for weapon '{item_id}'.")
+        # Add old armor back to inventory
+        character["inventory"].append(old_armor)
+        message_parts.append(f"Unequipped {old_armor}")
 
-    stat, value_str = effect.split(":")
-    value = int(value_str)
+    # Get new armor effect
+    try:
+        stat, value = get_item_effect(item_data)
+    except ValueError:
+        raise InvalidItemTypeError(f"Invalid effect format for armor '{item_id}'.")
 
-    # Apply new weapon stat bonus
+    # Apply new armor stat bonus
     character[stat] = character.get(stat, 0) + value
 
-    # Equip weapon
-    character["equipped_weapon"] = item_id
+    # Equip armor (remember its bonus so it can be removed later)
+    character["equipped_armor"] = item_id
+    character["equipped_armor_effect"] = (stat, value)
 
-    # Remove weapon from inventory
+    # Remove armor from inventory
     character["inventory"].remove(item_id)
 
     message_parts.append(f"Equipped {item_id} (+{value} {stat})")
@@ -368,16 +364,18 @@ def unequip_weapon(character):
         raise InventoryFullError("Inventory is full, cannot unequip weapon.")
 
     # Remove stat bonuses
-    effect = character["item_data"][equipped].get("effect", "")
-    if ":" in effect:
-        stat, value_str = effect.split(":")
-        character[stat] -= int(value_str)
+    effect = character.get("equipped_weapon_effect")
+    if effect is None:
+        effect = get_item_effect(character["item_data"][equipped])
+    stat, value = effect
+    character[stat] -= value
 
     # Return weapon to inventory
     character["inventory"].append(equipped)
 
     # Clear equipped weapon
     character["equipped_weapon"] = None
+    character["equipped_weapon_effect"] = None
 
     return equipped
     pass
@@ -401,16 +399,18 @@ def unequip_armor(character):
         raise InventoryFullError("Inventory is full, cannot unequip armor.")
 
     # Remove stat bonuses
-    effect = character["item_data"][equipped].get("effect", "")
-    if ":" in effect:
-        stat, value_str = effect.split(":")
-        character[stat] -= int(value_str)
+    effect = character.get("equipped_armor_effect")
+    if effect is None:
+        effect = get_item_effect(character["item_data"][equipped])
+    stat, value = effect
+    character[stat] -= value
 
     # Return armor to inventory
     character["inventory"].append(equipped)
 
     # Clear equipped armor
     character["equipped_armor"] = None
+    character["equipped_armor_effect"] = None
 
     return equipped
     pass
@@ -497,6 +497,7 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
+@lru_cache(maxsize=1024)
 def parse_item_effect(effect_string):
     """
     Parse item effect string into stat name and value
@@ -523,6 +524,20 @@ def parse_item_effect(effect_string):
     return stat_name, value
     pass
 
+def get_item_effect(item_data):
+    """
+    Get an item's effect as (stat_name, value)
+    
+    game_data.Item records carry the effect already parsed; plain item
+    dictionaries fall back to parsing their "stat:value" string.
+    
+    Raises: ValueError if the effect is missing or malformed
+    """
+    effect = getattr(item_data, "effect_pair", None)
+    if effect is not None:
+        return effect
+    return parse_item_effect(item_data.get("effect", ""))
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply a stat modification to character
@@ -27,6 +27,11 @@ current_character = None #player object data
 all_quests = {} #dictionary of all quests loaded from files
 all_items = {} #dictionary of shop/items
 game_running = False #controls the game loop
+quest_reloader = None #tracks quests.txt blocks for hot reload
+item_reloader = None #tracks items.txt blocks for hot reload
+save_service = None #writes saves in the background (WriteBehindSaver)
+reported_save_error = None #last background save failure shown to the player
+SAVES_PER_PAGE = 20 #saved characters shown per page in load_game
 
 # ============================================================================
 # MAIN MENU
@@ -134,30 +139,38 @@ def load_game():
     #Global makes function modify the global version of current_character and not a new local one
     print("\n=== LOAD GAME ===")
 
-    # Get list of saved characters
-    saved = character_manager.list_saved_characters()
-    #Calls character_manager.list_saved_characters() to get a list of names of saved characters.
+    # Get saved characters one page at a time (the list can be very long)
+    total = character_manager.count_saved_characters()
+    #Counts saves without listing them all (uses the name index when sharded)
 
-    if not saved:
+    if total == 0:
         print("No saved games found.")
         return
     #handles if now saves exist
-    print("\nSaved Characters:")
-    for i, name in enumerate(saved, start=1):
-        print(f"{i}. {name}")
-    #Causes saved characters to start a list starting at 1 and going up dependent on number of saves
-    # Select a file
-    choice = None
+    offset = 0
     while True:
-        choice = input("Select a character number: ").strip()
-        if choice.isdigit():
-            choice = int(choice)
-            if 1 <= choice <= len(saved):
-                break
+        saved = character_manager.list_saved_characters(offset=offset, limit=SAVES_PER_PAGE)
+        print("\nSaved Characters:")
+        for i, name in enumerate(saved, start=offset + 1):
+            print(f"{i}. {name}")
+        if total > SAVES_PER_PAGE:
+            print(f"(Showing {offset + 1}-{offset + len(saved)} of {total}. "
+                  f"Enter 'n' for next page, 'p' for previous page.)")
+        #Numbers keep counting up across pages so each save has one number
+        # Select a file
+        choice = input("Select a character number: ").strip().lower()
+        if choice == "n" and offset + SAVES_PER_PAGE < total:
+            offset += SAVES_PER_PAGE
+            continue
+        if choice == "p" and offset > 0:
+            offset -= SAVES_PER_PAGE
+            continue
+        if choice.isdigit() and offset < int(choice) <= offset + len(saved):
+            break
         print("Invalid input. Choose a valid character number.")
         #ask the user to choose a save file if it exist
         #Will loop until a valid save is choosen and checks if the number is within range 
-    selected_name = saved[choice - 1]
+    selected_name = saved[int(choice) - offset - 1]
 
     # Load character
     try:
@@ -201,6 +214,7 @@ def game_loop():
     print(f"\n=== Welcome, {current_character.name}! Your adventure begins. ===")
 
     while game_running:
+        report_failed_save()
         print("\n===== GAME MENU =====")
         print("1. View Character")
         print("2. Inventory")
@@ -227,11 +241,7 @@ def game_loop():
             #calls combat menu
 
         elif choice == "5":
-            try:
-                character_manager.save_character(current_character)
-                print("Game saved successfully!")
-            except Exception:
-                print("Error: Failed to save game.")
+            save_game()
 
         elif choice == "6":
             print("Returning to main menu...")
@@ -787,8 +797,12 @@ def save_game():
         return False
 
     try:
-        # Save character using character_manager
-        character_manager.save_character(current_character)
+        # Queue the save in the background if the saver is running
+        if save_service is not None:
+            report_failed_save()
+            save_service.save(current_character)
+        else:
+            character_manager.save_character(current_character)
         print(f"Game saved successfully for '{current_character['name']}'!")
         return True
     except FileNotFoundError:
@@ -801,6 +815,18 @@ def save_game():
     return False
     pass
 
+def report_failed_save():
+    """Tell the player (once) if a background save of the current character failed"""
+    global reported_save_error
+
+    if save_service is None or current_character is None:
+        return
+    # The saver keeps the last error per character until a save succeeds
+    error = save_service.errors.get(current_character['name'])
+    if error is not None and error is not reported_save_error:
+        reported_save_error = error
+        print(f"Error: Failed to save game. ({error}) Save again to retry.")
+
 def load_game_data():
     """Load all quest and item data from files"""
     global all_quests, all_items
@@ -811,8 +837,8 @@ def load_game_data():
     # Handle MissingDataFileError, InvalidDataFormatError
     # If files missing, create defaults with game_data.create_default_data_files()
     try:
-        # Attempt to load quests
-        all_quests = game_data.load_quests()
+        # Attempt to load quests (reuses the parsed cache when unchanged)
+        all_quests = game_data.load_quests_cached()
     except (MissingDataFileError, InvalidDataFormatError) as e:
         print(f"Warning: Could not load quest data ({e}). Creating default quests.")
         game_data.create_default_data_files()
@@ -822,8 +848,8 @@ def load_game_data():
         all_quests = {}
 
     try:
-        # Attempt to load items
-        all_items = game_data.load_items()
+        # Attempt to load items (reuses the parsed cache when unchanged)
+        all_items = game_data.load_items_cached()
     except (MissingDataFileError, InvalidDataFormatError) as e:
         print(f"Warning: Could not load item data ({e}). Creating default items.")
         game_data.create_default_data_files()
@@ -832,9 +858,44 @@ def load_game_data():
         print(f"Unexpected error loading items: {e}")
         all_items = {}
 
+    # Remember block hashes so edits can be hot-reloaded later
+    global quest_reloader, item_reloader
+    try:
+        quest_reloader = game_data.CatalogReloader("data/quests.txt", "quest", all_quests)
+        item_reloader = game_data.CatalogReloader("data/items.txt", "item", all_items)
+    except DataError as e:
+        print(f"Warning: Hot reload unavailable ({e}).")
+
     print("Game data loaded successfully.")
     pass
 
+def reload_game_data():
+    """
+    Re-read edited data files without restarting
+    
+    Only blocks that changed since the last load/reload are re-parsed, and
+    all_quests/all_items are updated in place.
+    
+    Returns: Dictionary {"quests": diff, "items": diff}, or None on error
+    """
+    if quest_reloader is None or item_reloader is None:
+        load_game_data()
+        return None
+
+    try:
+        changes = {
+            "quests": quest_reloader.reload(),
+            "items": item_reloader.reload()
+        }
+    except DataError as e:
+        print(f"Error reloading game data: {e}")
+        return None
+
+    for kind, diff in changes.items():
+        print(f"Reloaded {kind}: {len(diff['added'])} added, "
+              f"{len(diff['updated'])} updated, {len(diff['removed'])} removed")
+    return changes
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -870,6 +931,13 @@ def handle_character_death():
             # Revive character using character_manager
             revived = character_manager.revive_character(current_character)
             if revived:
+                # Make sure the revive is on disk before play continues
+                if save_service is not None:
+                    try:
+                        save_service.save(current_character)
+                        save_service.barrier(current_character['name'])
+                    except Exception as e:
+                        print(f"Warning: the revive could not be saved: {e}")
                 print(f"{current_character.name} has been revived with 50% health!")
                 return  # Continue game loop
             else:
@@ -897,6 +965,7 @@ def display_welcome():
 
 def main():
     """Main game execution function"""
+    global save_service
     
     # Display welcome message
     display_welcome()
@@ -914,19 +983,32 @@ def main():
         print("Please check data files for errors.")
         return
     
+    save_service = character_manager.WriteBehindSaver()
+    
+    # Show XP and level-up messages (character_manager reports them as events)
+    character_manager.EVENTS.subscribe(character_manager.ConsoleSink(), "xp_gained", "level_up")
+    
     # Main menu loop
-    while True:
-        choice = main_menu()
-        
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
-            break
-        else:
-            print("Invalid choice. Please select 1-3.")
+    try:
+        while True:
+            choice = main_menu()
+            
+            if choice == 1:
+                new_game()
+            elif choice == 2:
+                load_game()
+            elif choice == 3:
+                print("\nThanks for playing Quest Chronicles!")
+                break
+            else:
+                print("Invalid choice. Please select 1-3.")
+    finally:
+        # Write any saves still in the queue before exiting
+        try:
+            save_service.close()
+        except Exception as e:
+            print(f"Error: Failed to save game. ({e})")
+        save_service = None
 
 if __name__ == "__main__":
     main()
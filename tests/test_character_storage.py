@@ -0,0 +1,1034 @@
+"""
+Test Character Storage
+Tests the alternative save backends and character representations
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# JOURNAL BACKEND TESTS
+# ============================================================================
+
+def test_journal_appends_only_changed_fields(tmp_path):
+    """Test that later saves append small deltas instead of rewriting"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Journaler", "Rogue")
+    store.save_character(char)
+    snapshot = (tmp_path / "Journaler_save.txt").read_text()
+
+    char['gold'] = 150
+    store.save_character(char)
+    char['inventory'].append("health_potion")
+    store.save_character(char)
+    store.save_character(char)  # no changes, nothing written
+
+    journal = (tmp_path / "Journaler_save.journal").read_text().splitlines()
+    assert journal == ['{"gold":150,"version":2}', '{"inventory":["health_potion"],"version":3}']
+    assert (tmp_path / "Journaler_save.txt").read_text() == snapshot
+
+    loaded = character_manager.load_character("Journaler", str(tmp_path))
+    assert loaded['gold'] == 150
+    assert loaded['inventory'] == ["health_potion"]
+
+def test_journal_compacts_into_snapshot(tmp_path):
+    """Test that a large journal is folded back into the save file"""
+    store = character_manager.JournalSaveStore(str(tmp_path), compact_threshold=40)
+    char = character_manager.create_character("Compactor", "Mage")
+    store.save_character(char)
+
+    for gold in range(101, 106):
+        char['gold'] = gold
+        store.save_character(char)
+    store.wait_for_compaction()
+
+    journal = tmp_path / "Compactor_save.journal"
+    assert not journal.exists() or os.path.getsize(journal) < 40
+    assert "GOLD: 100" not in (tmp_path / "Compactor_save.txt").read_text()
+    assert character_manager.load_character("Compactor", str(tmp_path))['gold'] == 105
+
+def test_journal_ignores_torn_last_entry(tmp_path):
+    """Test that a half-written final entry doesn't break loading"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Torn", "Cleric")
+    store.save_character(char)
+    with open(tmp_path / "Torn_save.journal", "a") as f:
+        f.write('{"gold":5}\n{"gold":9')
+
+    assert character_manager.load_character("Torn", str(tmp_path))['gold'] == 5
+
+def test_file_save_replaces_journal(tmp_path):
+    """Test that a full save isn't overridden by an older journal"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Switcher", "Warrior")
+    store.save_character(char)
+    char['gold'] = 500
+    store.save_character(char)
+
+    loaded = character_manager.load_character("Switcher", str(tmp_path))
+    assert loaded['gold'] == 500
+    loaded['gold'] = 10
+    character_manager.save_character(loaded, str(tmp_path))
+
+    assert not (tmp_path / "Switcher_save.journal").exists()
+    assert character_manager.load_character("Switcher", str(tmp_path))['gold'] == 10
+
+def test_delete_removes_journal(tmp_path):
+    """Test that deleting a character also deletes its journal"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Gone", "Warrior")
+    store.save_character(char)
+    char['gold'] = 1
+    store.save_character(char)
+
+    store.delete_character("Gone")
+    assert os.listdir(tmp_path) == [".locks"]
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_store_round_trip(tmp_path):
+    """Test the single-character operations of the SQLite store"""
+    with character_manager.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        char = character_manager.create_character("Sql", "Cleric")
+        char['inventory'] = ["health_potion", "iron_sword"]
+
+        assert store.save_character(char) == True
+        assert store.load_character("Sql") == char
+        assert store.list_saved_characters() == ["Sql"]
+
+        char['gold'] = 5
+        store.save_character(char)
+        assert store.load_character("Sql")['gold'] == 5
+
+        assert store.delete_character("Sql") == True
+        with pytest.raises(CharacterNotFoundError):
+            store.load_character("Sql")
+        with pytest.raises(CharacterNotFoundError):
+            store.delete_character("Sql")
+
+def test_sqlite_store_batches(tmp_path):
+    """Test saving and loading many characters in one transaction"""
+    with character_manager.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        batch = [character_manager.create_character(f"Npc{i}", "Rogue") for i in range(50)]
+
+        assert store.save_characters(batch) == 50
+        loaded = store.load_characters(["Npc3", "Npc42"])
+        assert loaded["Npc42"] == batch[42]
+
+        with pytest.raises(CharacterNotFoundError, match="Nobody"):
+            store.load_characters(["Npc1", "Nobody"])
+
+def test_sqlite_store_rejects_corrupt_database(tmp_path):
+    """Test that a non-database file raises SaveFileCorruptedError"""
+    path = tmp_path / "saves.db"
+    path.write_bytes(b"this is not sqlite" * 100)
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.SQLiteCharacterStore(str(path))
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a save that fails midway leaves the old save intact"""
+    char = character_manager.create_character("Atomic", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    before = (tmp_path / "Atomic_save.txt").read_text()
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(character_manager.os, "replace", broken_replace)
+    char['gold'] = 999
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path))
+
+    assert (tmp_path / "Atomic_save.txt").read_text() == before
+    assert sorted(os.listdir(tmp_path)) == [".locks", "Atomic_save.txt"]
+
+@pytest.mark.parametrize("mode", ["always", "group"])
+def test_durable_save_modes(tmp_path, mode):
+    """Test that fsync modes write complete saves from many threads"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    chars = [character_manager.create_character(f"Durable{i}", "Mage") for i in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda c: character_manager.save_character(c, str(tmp_path), sync=mode), chars
+        ))
+
+    assert results == [True] * 20
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == sorted(c['name'] for c in chars)
+    assert character_manager.load_character("Durable7", str(tmp_path)) == chars[7]
+
+def test_group_commit_flushes_each_file(tmp_path, monkeypatch):
+    """Test that a batch fsyncs its own files instead of the whole system"""
+    synced = []
+    monkeypatch.setattr(character_manager.os, "sync", lambda: synced.append("all"), raising=False)
+    monkeypatch.setattr(character_manager.os, "fdatasync", synced.append, raising=False)
+    files = []
+    for name in ("a", "b", "c"):
+        temp_path = tmp_path / f"{name}.tmp"
+        temp_path.write_text(name)
+        files.append((str(temp_path), str(tmp_path / f"{name}.txt")))
+
+    character_manager.GroupCommitter().flush(files)
+
+    assert len(synced) == 3 and "all" not in synced
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt", "c.txt"]
+
+def test_unknown_sync_mode(tmp_path):
+    """Test that an unknown sync mode is rejected"""
+    char = character_manager.create_character("Sync", "Rogue")
+
+    with pytest.raises(ValueError):
+        character_manager.save_character(char, str(tmp_path), sync="sometimes")
+
+# ============================================================================
+# WRITE-BEHIND SAVE TESTS
+# ============================================================================
+
+def test_write_behind_coalesces_saves(tmp_path):
+    """Test that repeated saves of one character collapse into fewer writes"""
+    import threading
+    gate = threading.Event()
+    written = []
+
+    def slow_save(character, save_directory):
+        gate.wait()
+        written.append(character['gold'])
+        return character_manager.save_character(character, save_directory)
+
+    saver = character_manager.WriteBehindSaver(str(tmp_path), slow_save)
+    char = character_manager.create_character("Behind", "Rogue")
+    saver.save(char)
+    for gold in range(1, 50):
+        char['gold'] = gold
+        saver.save(char)
+    gate.set()
+    saver.close()
+
+    assert written[-1] == 49
+    assert len(written) <= 2
+    assert character_manager.load_character("Behind", str(tmp_path))['gold'] == 49
+
+def test_write_behind_saves_a_copy(tmp_path):
+    """Test that changes after save() don't leak into the queued write"""
+    import threading
+    gate = threading.Event()
+
+    def slow_save(character, save_directory):
+        gate.wait()
+        return character_manager.save_character(character, save_directory)
+
+    saver = character_manager.WriteBehindSaver(str(tmp_path), slow_save)
+    char = character_manager.create_character("Copy", "Mage")
+    saver.save(char)
+    char['inventory'].append("health_potion")
+    gate.set()
+    assert saver.barrier("Copy") == True
+    assert character_manager.load_character("Copy", str(tmp_path))['inventory'] == []
+    saver.close()
+
+def test_write_behind_barrier_reports_errors(tmp_path):
+    """Test that a failed background write is raised at the barrier"""
+    def failing_save(character, save_directory):
+        raise PermissionError("read-only")
+
+    saver = character_manager.WriteBehindSaver(str(tmp_path), failing_save)
+    saver.save(character_manager.create_character("Fails", "Cleric"))
+    with pytest.raises(PermissionError):
+        saver.barrier("Fails")
+    with pytest.raises(PermissionError):
+        saver.close()
+
+def test_write_behind_retries_failed_writes(tmp_path):
+    """Test that a failed write leaves the character dirty for the next save"""
+    attempts = []
+
+    def flaky_save(character, save_directory):
+        attempts.append(character['gold'])
+        if len(attempts) == 1:
+            raise PermissionError("read-only")
+        return character_manager.save_character(character, save_directory)
+
+    saver = character_manager.WriteBehindSaver(str(tmp_path), flaky_save)
+    char = character_manager.Character(character_manager.create_character("Retry", "Rogue"))
+    char['gold'] = 75
+    saver.save(char)
+    with pytest.raises(PermissionError):
+        saver.barrier("Retry")
+
+    assert "gold" in char.dirty_fields()
+    saver.save(char)
+    assert saver.barrier("Retry") == True
+    saver.close()
+    assert attempts == [75, 75]
+    assert character_manager.load_character("Retry", str(tmp_path))['gold'] == 75
+
+def test_write_behind_rejects_saves_after_close(tmp_path):
+    """Test that a closed saver refuses new work"""
+    saver = character_manager.WriteBehindSaver(str(tmp_path))
+    saver.close()
+
+    with pytest.raises(RuntimeError):
+        saver.save(character_manager.create_character("Late", "Warrior"))
+
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+def test_tracked_character_records_changes():
+    """Test that field and list changes are recorded until mark_clean"""
+    char = character_manager.create_character("Tracked", "Warrior")
+    assert char.is_dirty()
+    char.mark_clean()
+
+    char['gold'] = 100  # same value, not a change
+    assert char.dirty_fields() == frozenset()
+
+    char['gold'] += 5
+    char['inventory'].append("health_potion")
+    assert char.dirty_fields() == {"gold", "inventory"}
+
+    char.mark_clean()
+    char['active_quests'] = ["first_steps"]
+    char['active_quests'].remove("first_steps")
+    assert char.dirty_fields() == {"active_quests"}
+
+def test_tracked_character_copies_are_plain_data():
+    """Test that copies keep the data and dirty fields without sharing lists"""
+    import copy
+    import pickle
+
+    char = character_manager.create_character("Copied", "Mage")
+    char.mark_clean()
+    char['inventory'].append("iron_sword")
+
+    for clone in (copy.deepcopy(char), pickle.loads(pickle.dumps(char))):
+        assert clone == char
+        assert clone.dirty_fields() == {"inventory"}
+        clone['inventory'].append("health_potion")
+        assert char['inventory'] == ["iron_sword"]
+
+def test_unchanged_character_is_not_rewritten(tmp_path):
+    """Test that saving a loaded, unchanged character writes nothing"""
+    char = character_manager.create_character("Idle", "Rogue")
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Idle", str(tmp_path))
+    assert not loaded.is_dirty()
+
+    save_file = tmp_path / "Idle_save.txt"
+    os.utime(save_file, (0, 0))
+    character_manager.save_character(loaded, str(tmp_path))
+    assert os.path.getmtime(save_file) == 0
+
+    loaded['gold'] = 1
+    character_manager.save_character(loaded, str(tmp_path))
+    assert os.path.getmtime(save_file) != 0
+    assert not loaded.is_dirty()
+
+def test_unchanged_character_is_saved_to_a_new_directory(tmp_path):
+    """Test that the skip only applies to the file the character came from"""
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    character_manager.save_character(character_manager.create_character("Mover", "Mage"), first)
+    character_manager.save_character(character_manager.create_character("Mover", "Rogue"), second)
+
+    loaded = character_manager.load_character("Mover", first)
+    character_manager.save_character(loaded, second)
+
+    assert character_manager.load_character("Mover", second)['class'] == "Mage"
+
+def test_journal_writes_only_dirty_fields(tmp_path):
+    """Test that the journal store persists exactly the dirty fields"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Delta", "Cleric")
+    store.save_character(char)
+
+    char['health'] = 90
+    char['completed_quests'].append("first_steps")
+    store.save_character(char)
+    store.save_character(char)
+
+    journal = (tmp_path / "Delta_save.journal").read_text().splitlines()
+    assert len(journal) == 1
+    assert json_fields(journal[0]) == {"health", "completed_quests", "version"}
+
+def test_sqlite_updates_only_dirty_columns(tmp_path):
+    """Test that a tracked save doesn't overwrite columns it didn't change"""
+    with character_manager.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        char = character_manager.create_character("Partial", "Rogue")
+        store.save_character(char)
+
+        stale = store.load_character("Partial")
+        char['gold'] = 7
+        store.save_character(char)
+        stale['level'] = 2
+        store.save_character(stale)
+        store.save_character(stale)  # unchanged now
+
+        loaded = store.load_character("Partial")
+        assert (loaded['gold'], loaded['level']) == (7, 2)
+
+def test_sqlite_writes_full_rows_for_characters_from_elsewhere(tmp_path):
+    """Test that dirty fields from a save file don't leave stale columns"""
+    with character_manager.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        store.save_character(character_manager.create_character("Moved", "Mage"))  # old row
+        char = character_manager.create_character("Moved", "Mage")
+        char['level'] = 5
+        character_manager.save_character(char, str(tmp_path))
+
+        unchanged = character_manager.load_character("Moved", str(tmp_path))
+        store.save_character(unchanged)
+        assert store.load_character("Moved")['level'] == 5
+
+        store.save_character(character_manager.create_character("Moved", "Mage"))  # old row again
+        changed = character_manager.load_character("Moved", str(tmp_path))
+        changed['gold'] += 5
+        store.save_character(changed)
+        assert (store.load_character("Moved")['level'], store.load_character("Moved")['gold']) == (5, 105)
+
+def test_journal_compares_every_field_for_characters_from_elsewhere(tmp_path):
+    """Test that dirty fields relative to another save aren't the only ones journaled"""
+    store = character_manager.JournalSaveStore(str(tmp_path / "journal"))
+    store.save_character(character_manager.create_character("Moved", "Mage"))  # version 1
+    character_manager.save_character(character_manager.create_character("Moved", "Mage"), str(tmp_path))
+
+    char = character_manager.load_character("Moved", str(tmp_path))  # version 1 too
+    char['level'] = 5
+    character_manager.save_character(char, str(tmp_path / "other"))  # still version 1
+    char['gold'] += 5
+    store.save_character(char)
+
+    loaded = store.load_character("Moved")
+    assert (loaded['level'], loaded['gold']) == (5, 105)
+
+def json_fields(line):
+    """Field names in one journal entry"""
+    import json
+    return set(json.loads(line))
+
+
+# ============================================================================
+# COMPACT CHARACTER TESTS
+# ============================================================================
+
+def test_character_behaves_like_a_dict():
+    """Test that Character supports the dict operations the game uses"""
+    char = character_manager.create_character("Slots", "Rogue")
+    plain = dict(char)
+
+    assert isinstance(char, character_manager.Character)
+    assert not hasattr(char, "__dict__")
+    assert char == plain and plain == char
+    assert char['class'] == "Rogue" and char.get('missing', 5) == 5
+    assert list(char) == list(character_manager.SAVE_FIELD_TYPES)
+
+    char['equipped_weapon'] = "iron_sword"
+    assert char['equipped_weapon'] == "iron_sword"
+    assert "equipped_weapon" in char and len(char) == 13
+    del char['equipped_weapon']
+    with pytest.raises(KeyError):
+        char['equipped_weapon']
+
+def test_character_works_with_game_modules():
+    """Test inventory and character operations on a Character"""
+    import inventory_system
+
+    char = character_manager.create_character("Player", "Warrior")
+    char.mark_clean()
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    character_manager.add_gold(char, 25)
+
+    assert char['inventory'] == ["health_potion"]
+    assert char.dirty_fields() == {"inventory", "gold"}
+
+def test_character_lists_are_built_on_first_use():
+    """Test that list fields stay tuples until read and then stay the same list"""
+    char = character_manager.Character(
+        character_manager.create_character("Lazy", "Cleric"), inventory=["a", "b"]
+    )
+    assert char.peek('inventory') == ("a", "b")
+
+    inventory = char['inventory']
+    assert inventory == ["a", "b"] and char['inventory'] is inventory
+    assert char.copy()['inventory'] is not inventory
+
+def test_tracked_dict_still_supported(tmp_path):
+    """Test that a TrackedCharacter saves and skips like a Character"""
+    char = character_manager.TrackedCharacter(character_manager.create_character("Dicty", "Mage"))
+    assert type(char).__mro__[1] is dict
+
+    character_manager.save_character(char, str(tmp_path))
+    assert not char.is_dirty()
+    char['inventory'].append("health_potion")
+    assert char.dirty_fields() == {"inventory"}
+
+def test_character_uses_under_half_the_memory():
+    """Test the memory benchmark: Character is less than half a dict"""
+    import benchmarks
+
+    sizes = benchmarks.benchmark_character_memory(count=2000)
+    assert sizes["Character (fresh)"] < sizes["dict (fresh)"] / 2
+    assert sizes["Character (used)"] < sizes["dict (used)"] / 2
+
+
+# ============================================================================
+# ROSTER TESTS
+# ============================================================================
+
+def test_roster_bulk_create_matches_create_character():
+    """Test that roster rows look like create_character results"""
+    roster = character_manager.Roster()
+    rows = roster.create_characters(["Npc0", "Npc1", "Npc2"], "Mage")
+    roster.create_characters(["Guard"], "Warrior")
+
+    assert rows == range(0, 3) and len(roster) == 4
+    assert dict(roster[1]) == dict(character_manager.create_character("Npc1", "Mage"))
+    assert roster[-1]['class'] == "Warrior"
+    with pytest.raises(InvalidCharacterClassError):
+        roster.create_characters(["Bad"], "Bard")
+
+def test_roster_vectorized_operations():
+    """Test heal, gold, death and revive over masks"""
+    roster = character_manager.Roster()
+    roster.create_characters([f"Npc{i}" for i in range(4)], "Warrior")  # 120 health
+    roster.health = character_manager.array("q", [0, 50, 115, -5])
+
+    assert roster.is_character_dead() == [True, False, False, True]
+    assert list(roster.heal_characters(10, mask=[False, True, True, False])) == [0, 10, 5, 0]
+    assert list(roster.health) == [0, 60, 120, -5]
+
+    assert roster.revive_characters(roster.mask_for_rows([3])) == [False, False, False, True]
+    assert list(roster.health) == [0, 60, 120, 60]
+
+    roster.add_gold(-50, mask=[True, False, True, False])
+    assert list(roster.gold) == [50, 100, 50, 100]
+    with pytest.raises(ValueError):
+        roster.add_gold(-60)
+    assert list(roster.gold) == [50, 100, 50, 100]
+
+def test_roster_rows_work_with_single_character_functions(tmp_path):
+    """Test that a row view can be healed, given items and saved"""
+    import inventory_system
+
+    roster = character_manager.Roster()
+    roster.create_characters(["Row"], "Cleric")
+    row = roster[0]
+    row['health'] = 40
+    character_manager.heal_character(row, 25)
+    inventory_system.add_item_to_inventory(row, "health_potion")
+
+    assert roster.health[0] == 65
+    assert roster.inventory[0] == ["health_potion"]
+    character_manager.save_character(row, str(tmp_path))
+    assert character_manager.load_character("Row", str(tmp_path)) == roster.to_character(0)
+
+
+# ============================================================================
+# LEVELING TESTS
+# ============================================================================
+
+def level_by_loop(level, experience):
+    """The original one-level-at-a-time rule, for comparison"""
+    gained = 0
+    while experience >= (level + gained) * 100:
+        experience -= (level + gained) * 100
+        gained += 1
+    return gained, experience
+
+@pytest.mark.parametrize("level", [1, 2, 7, 50])
+def test_closed_form_matches_loop(level):
+    """Test levels_for_experience against the loop for many XP totals"""
+    for experience in list(range(0, 3000, 7)) + [10**6, 10**6 + 49]:
+        assert character_manager.levels_for_experience(level, experience) == level_by_loop(level, experience)
+
+def test_apply_experience_reports_levels():
+    """Test that a big award applies all stat gains in one step"""
+    char = character_manager.create_character("Grinder", "Mage")  # level 1, 80 health
+    char['health'] = 10
+
+    result = character_manager.apply_experience(char, 650)  # levels 2, 3 and 4 cost 600
+    assert result["levels"] == range(2, 5)
+    assert result["stat_gains"] == {"max_health": 30, "strength": 6, "magic": 6}
+    assert (char['level'], char['experience'], char['max_health'], char['health']) == (4, 50, 110, 110)
+
+    assert character_manager.apply_experience(char, 1)["levels"] == range(5, 5)
+
+def test_roster_gain_experience_matches_single():
+    """Test the vectorized award against apply_experience row by row"""
+    roster = character_manager.Roster()
+    roster.create_characters([f"Npc{i}" for i in range(6)], "Rogue")
+    roster.experience = character_manager.array("q", [0, 50, 99, 250, 0, 0])
+    roster.health[4] = 0
+    singles = [roster.to_character(i) for i in range(6)]
+
+    gained = roster.gain_experience(160, mask=[True] * 5 + [False])
+    for i in range(5):
+        if singles[i]['health'] > 0:
+            character_manager.apply_experience(singles[i], 160)
+    assert list(gained) == [1, 1, 1, 2, 0, 0]
+    assert [dict(row) for row in roster] == [dict(c) for c in singles]
+
+def test_negative_experience_gains_no_levels():
+    """Test that an XP penalty never raises or takes levels away"""
+    assert character_manager.levels_for_experience(1, -10) == (0, -10)
+    assert character_manager.levels_for_experience(5, -10) == (0, -10)
+
+    roster = character_manager.Roster()
+    roster.create_characters(["Low", "High"], "Rogue")
+    roster.level[1] = 5
+    gained = roster.gain_experience(-10)
+    assert list(gained) == [0, 0]
+    assert list(roster.level) == [1, 5]
+    assert list(roster.experience) == [-10, -10]
+
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_migrate_flat_directory_to_sharded(tmp_path):
+    """Test that migration moves saves and journals and keeps them loadable"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    for name in ("Ann", "Bob", "Cyd"):
+        char = character_manager.create_character(name, "Rogue")
+        store.save_character(char)
+    char['gold'] = 7
+    store.save_character(char)  # Cyd now has a journal
+
+    assert character_manager.migrate_to_sharded(str(tmp_path)) == 3
+    assert character_manager.is_sharded(str(tmp_path))
+    assert not list(tmp_path.glob("*_save.*"))
+
+    shard = character_manager.shard_for("Cyd")
+    assert (tmp_path / shard / "Cyd_save.journal").exists()
+    assert character_manager.load_character("Cyd", str(tmp_path))['gold'] == 7
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Ann", "Bob", "Cyd"]
+
+def test_sharded_index_tracks_saves_and_deletes(tmp_path):
+    """Test listing, paging and existence checks through the name index"""
+    character_manager.migrate_to_sharded(str(tmp_path))
+    for i in range(10):
+        character_manager.save_character(character_manager.create_character(f"Npc{i}", "Mage"), str(tmp_path))
+    character_manager.delete_character("Npc3", str(tmp_path))
+
+    assert character_manager.count_saved_characters(str(tmp_path)) == 9
+    assert character_manager.list_saved_characters(str(tmp_path), offset=2, limit=3) == ["Npc2", "Npc4", "Npc5"]
+    assert character_manager.save_exists("Npc4", str(tmp_path))
+    assert not character_manager.save_exists("Npc3", str(tmp_path))
+
+    index_lines = (tmp_path / "names.index").read_text().splitlines()
+    assert index_lines.count("+Npc0") == 1 and "-Npc3" in index_lines
+
+def test_sharded_index_sees_other_writers(tmp_path):
+    """Test that a change made through a second index object is picked up"""
+    character_manager.migrate_to_sharded(str(tmp_path))
+    character_manager.save_character(character_manager.create_character("Mine", "Cleric"), str(tmp_path))
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Mine"]
+
+    other = character_manager.SaveIndex(str(tmp_path))
+    other.add("Theirs")
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Mine", "Theirs"]
+
+def churn_index(save_directory, prefix, times):
+    """Worker process: add names, adding and removing a scratch name to force rewrites"""
+    index = character_manager.SaveIndex(save_directory)
+    for i in range(times):
+        index.add(f"{prefix}{i}")
+        for scratch in ("a", "b", "c"):
+            index.add(f"{prefix}tmp_{scratch}")
+            index.remove(f"{prefix}tmp_{scratch}")
+
+def test_sharded_index_survives_concurrent_rewrites(tmp_path):
+    """Test that appends from one process aren't lost to another's rewrite"""
+    import multiprocessing
+
+    character_manager.migrate_to_sharded(str(tmp_path))
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=churn_index, args=(str(tmp_path), f"P{n}_", 200)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    expected = sorted(f"P{n}_{i}" for n in range(4) for i in range(200))
+    assert character_manager.SaveIndex(str(tmp_path)).page() == expected
+
+def test_flat_listing_pages(tmp_path):
+    """Test offset/limit on a flat save directory"""
+    for name in ("Cy", "Al", "Bo"):
+        character_manager.save_character(character_manager.create_character(name, "Warrior"), str(tmp_path))
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", "Bo", "Cy"]
+    assert character_manager.list_saved_characters(str(tmp_path), offset=1, limit=1) == ["Bo"]
+
+
+# ============================================================================
+# SAVE PARSER TESTS
+# ============================================================================
+
+SAVE_BYTES = (
+    b"NAME: Parsed\nCLASS: Mage\nLEVEL: 3\nHEALTH: 80\nMAX_HEALTH: 100\n"
+    b"STRENGTH: 8\nMAGIC: 24\nEXPERIENCE: 10\nGOLD: 5\n"
+    b"INVENTORY: health_potion,iron_sword\nACTIVE_QUESTS: \nCOMPLETED_QUESTS: first_steps\n"
+)
+
+def test_parse_save_bytes_fields():
+    """Test the one-pass parser, including keys with odd case and spacing"""
+    char = character_manager.parse_save_bytes(SAVE_BYTES.replace(b"GOLD:", b" gold :"))
+
+    assert char['gold'] == 5 and char['level'] == 3
+    assert char['inventory'] == ["health_potion", "iron_sword"]
+    assert char['active_quests'] == []
+    assert char['name'] == "Parsed"
+
+@pytest.mark.parametrize("data, error", [
+    (SAVE_BYTES.replace(b"GOLD: 5", b"GOLD: -5"), InvalidSaveDataError),
+    (SAVE_BYTES.replace(b"GOLD: 5\n", b""), InvalidSaveDataError),
+    (SAVE_BYTES + b"MOOD: happy\n", InvalidSaveDataError),
+    (SAVE_BYTES + b"\n\n", InvalidSaveDataError),
+    (SAVE_BYTES.replace(b"Parsed", b"\xff\xfe"), SaveFileCorruptedError),
+])
+def test_parse_save_bytes_rejects_bad_saves(data, error):
+    """Test that bad saves raise the same errors load_character always did"""
+    with pytest.raises(error):
+        character_manager.parse_save_bytes(data)
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_load_characters_in_bulk(tmp_path, workers):
+    """Test loading many saves at once, with and without a thread pool"""
+    chars = [character_manager.create_character(f"Bulk{i}", "Rogue") for i in range(30)]
+    for char in chars:
+        character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_characters([c['name'] for c in chars], str(tmp_path), workers=workers)
+    assert list(loaded) == [c['name'] for c in chars]
+    assert loaded["Bulk17"] == chars[17]
+
+    with pytest.raises(CharacterNotFoundError, match="Ghost"):
+        character_manager.load_characters(["Bulk1", "Ghost"], str(tmp_path), workers=workers)
+
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+def test_cache_hits_and_lru_eviction(tmp_path):
+    """Test hit/miss counting and that the least recently used entry goes first"""
+    for name in ("A", "B", "C"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"), str(tmp_path))
+    cache = character_manager.CharacterCache(str(tmp_path), max_entries=2)
+
+    first = cache.get("A")
+    assert cache.get("A") is first
+    cache.get("B")
+    cache.get("A")
+    cache.get("C")  # evicts B, the least recently used
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 3, 1, 2)
+    cache.get("B")
+    assert cache.stats()["misses"] == 4
+
+def test_cache_byte_limit(tmp_path):
+    """Test that max_bytes bounds the total save-text size"""
+    cache = character_manager.CharacterCache(str(tmp_path), max_entries=None, max_bytes=400)
+    for i in range(5):
+        cache.save(character_manager.create_character(f"Sized{i}", "Rogue"))
+
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= 400 and stats["entries"] < 5
+    assert stats["evictions"] == 5 - stats["entries"]
+
+def test_cache_write_back_saves_on_eviction_and_flush(tmp_path):
+    """Test that write-back delays writes until eviction or flush"""
+    cache = character_manager.CharacterCache(str(tmp_path), max_entries=1, write_back=True)
+    first = character_manager.create_character("Later", "Cleric")
+    cache.save(first)
+    assert character_manager.list_saved_characters(str(tmp_path)) == []
+
+    cache.save(character_manager.create_character("Newer", "Cleric"))  # evicts Later
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Later"]
+    assert cache.flush() == 1
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Later", "Newer"]
+
+@pytest.mark.parametrize("limits", [{"max_entries": 0}, {"max_bytes": 10}])
+def test_cache_write_back_writes_entries_that_cannot_stay(tmp_path, limits):
+    """Test that a character too big for the cache is written right away"""
+    cache = character_manager.CharacterCache(str(tmp_path), write_back=True, **limits)
+    assert cache.save(character_manager.create_character("Huge", "Mage")) == True
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Huge"]
+    assert cache.flush() == 0
+
+def test_delete_character_invalidates_caches(tmp_path):
+    """Test that deleting a save drops it from caches on that directory"""
+    cache = character_manager.CharacterCache(str(tmp_path))
+    cache.save(character_manager.create_character("Doomed", "Warrior"))
+    assert cache.stats()["entries"] == 1
+
+    character_manager.delete_character("Doomed", str(tmp_path))
+    assert cache.stats()["entries"] == 0
+    with pytest.raises(CharacterNotFoundError):
+        cache.get("Doomed")
+
+def test_cache_over_sqlite_store(tmp_path):
+    """Test a write-through cache in front of another backend"""
+    with character_manager.SQLiteCharacterStore(str(tmp_path / "saves.db")) as store:
+        cache = character_manager.CharacterCache(store=store)
+        char = character_manager.create_character("Cached", "Mage")
+        cache.save(char)
+
+        assert store.load_character("Cached") == char
+        assert cache.get("Cached") is char
+        assert cache.stats()["hits"] == 1
+
+
+# ============================================================================
+# SAVE LOCKING TESTS
+# ============================================================================
+
+def test_save_versions_detect_conflicts(tmp_path):
+    """Test that saving over a newer version raises SaveConflictError"""
+    character_manager.save_character(character_manager.create_character("Shared", "Rogue"), str(tmp_path))
+    first = character_manager.load_character("Shared", str(tmp_path))
+    second = character_manager.load_character("Shared", str(tmp_path))
+    assert first['version'] == second['version'] == 1
+
+    first['gold'] = 1
+    character_manager.save_character(first, str(tmp_path))
+    assert first['version'] == 2
+
+    second['gold'] = 2
+    with pytest.raises(SaveConflictError):
+        character_manager.save_character(second, str(tmp_path))
+
+    fresh = character_manager.load_character("Shared", str(tmp_path))
+    assert fresh['gold'] == 1
+    fresh['gold'] = 3
+    character_manager.save_character(fresh, str(tmp_path))
+    assert "VERSION: 3" in (tmp_path / "Shared_save.txt").read_text()
+
+def test_unversioned_saves_still_load(tmp_path):
+    """Test saves written before version stamps, and new characters overwriting"""
+    char = character_manager.create_character("Legacy", "Cleric")
+    (tmp_path / "Legacy_save.txt").write_text(character_manager.format_save_text(char))
+
+    loaded = character_manager.load_character("Legacy", str(tmp_path))
+    assert loaded['version'] == 0
+    character_manager.save_character(character_manager.create_character("Legacy", "Mage"), str(tmp_path))
+    assert character_manager.load_character("Legacy", str(tmp_path))['version'] == 1
+
+    # A copy loaded before the first stamped save is out of date
+    loaded['gold'] = 1
+    with pytest.raises(SaveConflictError):
+        character_manager.save_character(loaded, str(tmp_path))
+
+def test_load_without_lock_file(tmp_path, monkeypatch):
+    """Test that saves in a directory we can't create .locks in still load"""
+    character_manager.save_character(character_manager.create_character("ReadOnly", "Mage"), str(tmp_path))
+
+    def read_only(save_directory):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(character_manager, "open_lock_file", read_only)
+    assert character_manager.load_character("ReadOnly", str(tmp_path))['class'] == "Mage"
+    with pytest.raises(PermissionError):
+        character_manager.save_character(character_manager.create_character("ReadOnly", "Rogue"), str(tmp_path))
+
+def test_lock_files_are_closed(tmp_path):
+    """Test that lock file descriptors don't outlive their locks"""
+    character_manager.save_character(character_manager.create_character("Closer", "Cleric"), str(tmp_path))
+    character_manager.load_character("Closer", str(tmp_path))
+
+    assert character_manager.LOCK_FILES == {}
+
+def test_write_behind_keeps_versions(tmp_path):
+    """Test that background saves check and advance the live character's version"""
+    character_manager.save_character(character_manager.create_character("Queued", "Rogue"), str(tmp_path))
+    loaded = character_manager.load_character("Queued", str(tmp_path))
+    saver = character_manager.WriteBehindSaver(str(tmp_path))
+    loaded['gold'] = 5
+    saver.save(loaded)
+    saver.flush()
+
+    assert loaded['version'] == 2 and not loaded.is_dirty()
+    loaded['gold'] = 6
+    character_manager.save_character(loaded, str(tmp_path))
+    assert loaded['version'] == 3
+
+    stale = character_manager.load_character("Queued", str(tmp_path))
+    character_manager.save_character(loaded.copy(), str(tmp_path))
+    stale['gold'] = 7
+    saver.save(stale)
+    with pytest.raises(SaveConflictError):
+        saver.close()
+
+def test_journal_snapshots_keep_versions(tmp_path):
+    """Test that journal snapshots are stamped and compaction keeps the version"""
+    store = character_manager.JournalSaveStore(str(tmp_path), compact_threshold=40)
+    char = character_manager.create_character("Stamped", "Mage")
+    store.save_character(char)
+    assert char['version'] == 1
+    for gold in range(10):
+        char['gold'] = gold
+        store.save_character(char)
+    store.wait_for_compaction()
+    assert char['version'] == 11  # one per snapshot or journal entry
+
+    store.compact("Stamped")
+    assert "VERSION: 11" in (tmp_path / "Stamped_save.txt").read_text()
+    loaded = character_manager.load_character("Stamped", str(tmp_path))
+    assert (loaded['gold'], loaded['version']) == (9, 11)
+    loaded['gold'] = 50
+    character_manager.save_character(loaded, str(tmp_path))
+    assert loaded['version'] == 12
+
+def test_journal_append_detects_conflicts(tmp_path):
+    """Test that a journal append over another writer's save raises"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    char = character_manager.create_character("Racer", "Rogue")
+    store.save_character(char)
+
+    other = character_manager.load_character("Racer", str(tmp_path))
+    other['gold'] += 1000
+    character_manager.save_character(other, str(tmp_path))
+
+    char['gold'] = 101
+    with pytest.raises(SaveConflictError):
+        store.save_character(char)
+    assert character_manager.load_character("Racer", str(tmp_path))['gold'] == 1100
+
+def test_journal_diffs_against_other_writers_saves(tmp_path):
+    """Test that an unversioned save after another writer's save writes every difference"""
+    store = character_manager.JournalSaveStore(str(tmp_path))
+    store.save_character(character_manager.create_character("Shared", "Mage"))
+
+    other = character_manager.load_character("Shared", str(tmp_path))
+    other['gold'] = 5
+    character_manager.save_character(other, str(tmp_path))
+
+    fresh = character_manager.create_character("Shared", "Mage")  # no version
+    store.save_character(fresh)
+    assert character_manager.load_character("Shared", str(tmp_path))['gold'] == 100
+    assert fresh['version'] == 3
+
+def add_gold_with_retries(save_directory, times):
+    """Worker process: load, add 1 gold, save; retry on conflicts"""
+    for i in range(times):
+        while True:
+            char = character_manager.load_character("Contended", save_directory)
+            char['gold'] += 1
+            try:
+                character_manager.save_character(char, save_directory)
+                break
+            except SaveConflictError:
+                continue
+
+def test_concurrent_processes_lose_no_updates(tmp_path):
+    """Test optimistic saves from several processes against one character"""
+    import multiprocessing
+
+    character_manager.save_character(character_manager.create_character("Contended", "Warrior"), str(tmp_path))
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=add_gold_with_retries, args=(str(tmp_path), 20)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert character_manager.load_character("Contended", str(tmp_path))['gold'] == 100 + 80
+
+
+# ============================================================================
+# EVENT BUS TESTS
+# ============================================================================
+
+@pytest.fixture
+def subscribe():
+    """Subscribe handlers to the global bus for one test only"""
+    added = []
+
+    def add(handler, *events):
+        added.append(handler)
+        return character_manager.EVENTS.subscribe(handler, *events)
+
+    yield add
+    for handler in added:
+        character_manager.EVENTS.unsubscribe(handler)
+
+def test_progression_emits_events(subscribe):
+    """Test the events sent by XP, gold, healing and revival"""
+    log = subscribe(character_manager.BufferedLogSink())
+    char = character_manager.create_character("Evented", "Warrior")
+
+    character_manager.gain_experience(char, 350)  # two levels
+    character_manager.add_gold(char, -40)
+    char['health'] = 0
+    character_manager.revive_character(char)
+    character_manager.heal_character(char, 5)
+
+    events = log.flush()
+    assert [e['event'] for e in events] == ["xp_gained", "level_up", "gold_changed", "revived", "healed"]
+    assert events[1]['levels'] == range(2, 4) and events[1]['new_level'] == 3
+    assert events[2] == {"event": "gold_changed", "character": "Evented", "amount": -40, "gold": 60}
+    assert log.flush() == []
+
+def test_no_output_without_subscribers(capsys):
+    """Test that gain_experience no longer prints on its own"""
+    char = character_manager.create_character("Quiet", "Mage")
+    assert character_manager.gain_experience(char, 1000) == True
+    assert capsys.readouterr().out == ""
+
+def test_console_sink_prints_level_up(subscribe, capsys):
+    """Test the console sink's messages"""
+    subscribe(character_manager.ConsoleSink(), "xp_gained", "level_up")
+    char = character_manager.create_character("Loud", "Rogue")
+    character_manager.gain_experience(char, 100)
+    character_manager.add_gold(char, 5)  # not subscribed
+
+    out = capsys.readouterr().out
+    assert "+100 XP gained!" in out and "LEVEL UP! You are now level 2!" in out
+    assert "gold" not in out
+
+def test_buffered_log_sink_writes_in_batches(subscribe):
+    """Test that the log sink writes JSON lines once its buffer fills"""
+    import io
+    import json
+
+    stream = io.StringIO()
+    subscribe(character_manager.BufferedLogSink(stream, buffer_size=3), "gold_changed")
+    char = character_manager.create_character("Logged", "Cleric")
+    for i in range(4):
+        character_manager.add_gold(char, 1)
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)['gold'] for line in lines] == [101, 102, 103]
+
+def test_event_bus_subscriptions():
+    """Test unsubscribe, the null sink and unknown event names"""
+    bus = character_manager.EventBus()
+    sink = bus.subscribe(character_manager.NullSink())
+    assert set(bus.handlers) == set(character_manager.EVENT_TYPES)
+
+    bus.unsubscribe(sink)
+    assert bus.handlers == {}
+    with pytest.raises(ValueError):
+        bus.subscribe(sink, "exploded")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,648 @@
+"""
+Test Data Catalogs
+Tests the streaming, cached and indexed quest/item catalog loaders
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_TEXT = (
+    "QUEST_ID: first_steps\n"
+    "TITLE: First Steps\n"
+    "DESCRIPTION: Begin your adventure\n"
+    "REWARD_XP: 50\n"
+    "REWARD_GOLD: 25\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+    "\n"
+    "QUEST_ID: goblin_hunter\n"
+    "TITLE: Goblin Hunter\n"
+    "DESCRIPTION: Defeat 3 goblins\n"
+    "REWARD_XP: 100\n"
+    "REWARD_GOLD: 75\n"
+    "REQUIRED_LEVEL: 2\n"
+    "PREREQUISITE: first_steps\n"
+)
+
+ITEM_TEXT = (
+    "ITEM_ID: health_potion\n"
+    "NAME: Health Potion\n"
+    "TYPE: consumable\n"
+    "EFFECT: health:20\n"
+    "COST: 25\n"
+    "DESCRIPTION: Restores 20 health points\n"
+    "\n"
+    "ITEM_ID: iron_sword\n"
+    "NAME: Iron Sword\n"
+    "TYPE: weapon\n"
+    "EFFECT: strength:5\n"
+    "COST: 50\n"
+    "DESCRIPTION: A sturdy sword\n"
+)
+
+def write_file(tmp_path, name, text):
+    """Write text to a file in tmp_path and return its path"""
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_blocks_in_order(tmp_path):
+    """Test that iter_quests parses one quest per block"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = list(game_data.iter_quests(path))
+
+    assert [q['quest_id'] for q in quests] == ["first_steps", "goblin_hunter"]
+    assert quests[1]['required_level'] == 2
+
+def test_iter_items_tolerates_extra_blank_lines(tmp_path):
+    """Test that repeated blank lines don't create empty blocks"""
+    path = write_file(tmp_path, "items.txt", "\n\n" + ITEM_TEXT.replace("\n\n", "\n\n\n"))
+    items = list(game_data.iter_items(path))
+
+    assert [i['item_id'] for i in items] == ["health_potion", "iron_sword"]
+
+def test_load_items_matches_iter_items(tmp_path):
+    """Test that load_items is built from the streaming parser"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(path)
+
+    assert items == {i['item_id']: i for i in game_data.iter_items(path)}
+
+def test_empty_quest_file_is_invalid(tmp_path):
+    """Test that an empty file still raises InvalidDataFormatError"""
+    path = write_file(tmp_path, "quests.txt", "\n\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(path)
+
+# ============================================================================
+# CATALOG CACHE TESTS
+# ============================================================================
+
+def test_cached_load_writes_and_reuses_cache(tmp_path, monkeypatch):
+    """Test that a second cached load skips parsing"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    first = game_data.load_quests_cached(path)
+    assert os.path.exists(path + game_data.CACHE_SUFFIX)
+
+    def fail(filename):
+        raise AssertionError("source should not be re-parsed")
+
+    monkeypatch.setattr(game_data, "load_quests", fail)
+    assert game_data.load_cached_catalog(path, game_data.load_quests) == first
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    """Test that editing the source file forces a re-parse"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    game_data.load_items_cached(path)
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: 30"))
+    items = game_data.load_items_cached(path)
+
+    assert items['health_potion']['cost'] == 30
+
+def test_corrupted_cache_is_ignored(tmp_path):
+    """Test that a garbage cache file falls back to parsing"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    with open(path + game_data.CACHE_SUFFIX, "wb") as f:
+        f.write(b"not a cache")
+
+    assert set(game_data.load_items_cached(path)) == {"health_potion", "iron_sword"}
+
+# ============================================================================
+# INDEXED CATALOG TESTS
+# ============================================================================
+
+def test_indexed_catalog_lookup(tmp_path):
+    """Test that an indexed catalog decodes records by id"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    catalog_path = game_data.build_quest_catalog(path)
+
+    with game_data.IndexedCatalog(catalog_path) as catalog:
+        assert len(catalog) == 2
+        assert "goblin_hunter" in catalog
+        assert catalog["goblin_hunter"] == game_data.load_quests(path)["goblin_hunter"]
+        with pytest.raises(KeyError):
+            catalog["missing_quest"]
+
+def test_indexed_catalog_works_with_quest_handler(tmp_path):
+    """Test that quest_handler accepts an IndexedCatalog as quest_data_dict"""
+    import quest_handler
+
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    char = {'level': 1, 'active_quests': [], 'completed_quests': []}
+
+    with game_data.IndexedCatalog(game_data.build_quest_catalog(path)) as catalog:
+        available = quest_handler.get_available_quests(char, catalog)
+        assert [q['quest_id'] for q in available] == ["first_steps"]
+        assert quest_handler.accept_quest(char, "first_steps", catalog)
+
+def test_indexed_catalog_rejects_other_files(tmp_path):
+    """Test that opening a non-catalog file raises CorruptedDataError"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+
+    with pytest.raises(CorruptedDataError):
+        game_data.IndexedCatalog(path)
+
+# ============================================================================
+# PARALLEL LOADER TESTS
+# ============================================================================
+
+def test_parallel_load_matches_serial(tmp_path):
+    """Test that chunked parallel parsing gives the same catalog"""
+    blocks = [ITEM_TEXT.replace("health_potion", f"potion_{i}") for i in range(20)]
+    path = write_file(tmp_path, "items.txt", "\n".join(blocks))
+
+    serial = game_data.load_items(path)
+    parallel = game_data.load_items_parallel(path, workers=3)
+
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+
+def test_split_at_block_boundaries_covers_file(tmp_path):
+    """Test that byte ranges are contiguous and end on blank lines"""
+    path = write_file(tmp_path, "quests.txt", "\n".join([QUEST_TEXT] * 10))
+    ranges = game_data.split_at_block_boundaries(path, 4)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    for start, end in ranges[:-1]:
+        assert data[:end].endswith(b"\n\n")
+
+def test_parallel_load_reports_bad_block_line(tmp_path):
+    """Test that parallel loading raises the same error type with a line number"""
+    bad = QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: lots")
+    path = write_file(tmp_path, "quests.txt", "\n".join([QUEST_TEXT] * 5 + [bad]))
+
+    with pytest.raises(InvalidDataFormatError, match="line 89"):
+        game_data.load_quests_parallel(path, workers=2)
+
+def test_parallel_load_rejects_invalid_utf8(tmp_path):
+    """Test that undecodable text raises CorruptedDataError like the serial loader"""
+    path = tmp_path / "quests.txt"
+    path.write_bytes(QUEST_TEXT.replace("First Steps", "\xff\xfe").encode("latin-1"))
+
+    with pytest.raises(CorruptedDataError):
+        game_data.load_quests(str(path))
+    with pytest.raises(CorruptedDataError, match="line 2"):
+        game_data.load_quests_parallel(str(path), workers=2)
+
+def test_parallel_load_rejects_compressed_files(tmp_path):
+    """Test that .gz files aren't split as raw compressed bytes"""
+    import gzip
+
+    path = str(tmp_path / "quests.txt.gz")
+    with gzip.open(path, "wt") as f:
+        f.write(QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError, match="compressed"):
+        game_data.load_quests_parallel(path, workers=2)
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_parses_on_access(tmp_path):
+    """Test that LazyCatalog only parses the blocks that are read"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    catalog = game_data.LazyCatalog(path, "quest")
+
+    assert set(catalog) == {"first_steps", "goblin_hunter"}
+    assert catalog.parsed == {}
+
+    quest = catalog["goblin_hunter"]
+    assert quest['reward_gold'] == 75
+    assert list(catalog.parsed) == ["goblin_hunter"]
+    assert catalog["goblin_hunter"] is quest
+
+def test_lazy_catalog_with_quest_handler(tmp_path):
+    """Test that quest_handler iterates a LazyCatalog like a dict"""
+    import quest_handler
+
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    catalog = game_data.LazyCatalog(path, "quest")
+
+    assert catalog == game_data.load_quests(path)
+    levels = quest_handler.get_quests_by_level(catalog, 2, 5)
+    assert [q['quest_id'] for q in levels] == ["goblin_hunter"]
+
+def test_lazy_catalog_defers_validation_errors(tmp_path):
+    """Test that a bad block only fails when it is read"""
+    bad = ITEM_TEXT.replace("TYPE: weapon", "TYPE: shield")
+    path = write_file(tmp_path, "items.txt", bad)
+    catalog = game_data.LazyCatalog(path, "item")
+
+    assert catalog["health_potion"]['cost'] == 25
+    with pytest.raises(InvalidDataFormatError, match="line 8"):
+        catalog["iron_sword"]
+
+def test_lazy_catalog_rejects_invalid_utf8(tmp_path):
+    """Test that an undecodable block raises CorruptedDataError"""
+    path = tmp_path / "quests.txt"
+    path.write_bytes(QUEST_TEXT.replace("Goblin", "G\xff").encode("latin-1"))
+    catalog = game_data.LazyCatalog(str(path), "quest")
+
+    assert catalog["first_steps"]['reward_gold'] > 0
+    with pytest.raises(CorruptedDataError, match="line 9"):
+        catalog["goblin_hunter"]
+
+def test_lazy_catalog_reads_compressed_files(tmp_path):
+    """Test lookups and error lines in a gzip-compressed catalog"""
+    import gzip
+
+    path = str(tmp_path / "items.txt.gz")
+    with gzip.open(path, "wt") as f:
+        f.write(ITEM_TEXT.replace("TYPE: weapon", "TYPE: shield"))
+    catalog = game_data.LazyCatalog(path, "item")
+
+    assert catalog["health_potion"]['cost'] == 25
+    with pytest.raises(InvalidDataFormatError, match="line 8"):
+        catalog["iron_sword"]
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_reloader_applies_diff_in_place(tmp_path):
+    """Test that reload() adds, updates and removes changed quests only"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(path)
+    untouched = quests["first_steps"]
+    reloader = game_data.CatalogReloader(path, "quest", quests)
+
+    edited = QUEST_TEXT.replace("goblin_hunter", "orc_slayer").replace("REWARD_XP: 50", "REWARD_XP: 60")
+    write_file(tmp_path, "quests.txt", edited)
+    diff = reloader.reload()
+
+    assert diff == {"added": ["orc_slayer"], "updated": ["first_steps"], "removed": ["goblin_hunter"]}
+    assert quests["first_steps"]['reward_xp'] == 60
+    assert quests["first_steps"] is not untouched
+    assert set(quests) == {"first_steps", "orc_slayer"}
+
+def test_reloader_skips_unchanged_blocks(tmp_path):
+    """Test that unchanged blocks keep their existing records"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(path)
+    potion = items["health_potion"]
+    reloader = game_data.CatalogReloader(path, "item", items)
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 50", "COST: 55"))
+    diff = reloader.reload()
+
+    assert diff["updated"] == ["iron_sword"]
+    assert items["health_potion"] is potion
+
+def test_reloader_bad_edit_leaves_catalog_untouched(tmp_path):
+    """Test that a bad block aborts the reload without partial changes"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(path)
+    before = dict(items)
+    reloader = game_data.CatalogReloader(path, "item", items)
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: 26").replace("COST: 50", "COST: x"))
+    with pytest.raises(InvalidDataFormatError):
+        reloader.reload()
+    assert items == before
+
+def test_reloader_rejects_invalid_utf8(tmp_path):
+    """Test that an undecodable edit isn't applied to the catalog"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(path)
+    reloader = game_data.CatalogReloader(path, "quest", quests)
+
+    (tmp_path / "quests.txt").write_bytes(QUEST_TEXT.replace("Goblin", "G\xff").encode("latin-1"))
+    with pytest.raises(CorruptedDataError, match="line 9"):
+        reloader.reload()
+    assert quests["goblin_hunter"]['title'] == "Goblin Hunter"
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_loaded_items_are_compact_records(tmp_path):
+    """Test that loaders produce slotted records with a pre-parsed effect"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    sword = game_data.load_items(path)["iron_sword"]
+
+    assert isinstance(sword, game_data.Item)
+    assert not hasattr(sword, "__dict__")
+    assert sword.effect_pair == ("strength", 5)
+    assert sword["effect"] == "strength:5"
+    assert sword.get("cost") == 50
+    assert dict(sword) == {
+        'item_id': 'iron_sword', 'name': 'Iron Sword', 'type': 'weapon',
+        'effect': 'strength:5', 'cost': 50, 'description': 'A sturdy sword'
+    }
+
+def test_quest_record_behaves_like_dict(tmp_path):
+    """Test that Quest records support the dict access quest_handler uses"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quest = game_data.load_quests(path)["goblin_hunter"]
+
+    assert isinstance(quest, game_data.Quest)
+    assert quest['prerequisite'] == "first_steps"
+    assert quest.get("missing", "default") == "default"
+    assert 'title' in quest
+
+def test_item_record_rejects_non_numeric_effect(tmp_path):
+    """Test that a bad effect value is caught at load time"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT.replace("strength:5", "strength:lots"))
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(path)
+
+def test_equip_with_item_records(tmp_path):
+    """Test equipping weapons and armor from loaded Item records"""
+    import inventory_system
+
+    armor_text = ITEM_TEXT.replace("iron_sword", "leather_armor").replace(
+        "TYPE: weapon", "TYPE: armor").replace("strength:5", "max_health:10")
+    items = game_data.load_items(write_file(tmp_path, "items.txt", ITEM_TEXT))
+    items.update(game_data.load_items(write_file(tmp_path, "armor.txt", armor_text)))
+    char = {'inventory': ['iron_sword', 'leather_armor', 'health_potion'],
+            'strength': 10, 'max_health': 100, 'health': 50}
+
+    inventory_system.equip_weapon(char, "iron_sword", items["iron_sword"])
+    inventory_system.equip_armor(char, "leather_armor", items["leather_armor"])
+    inventory_system.use_item(char, "health_potion", items["health_potion"])
+    assert (char['strength'], char['max_health'], char['health']) == (15, 110, 70)
+
+    assert inventory_system.unequip_weapon(char) == "iron_sword"
+    assert inventory_system.unequip_armor(char) == "leather_armor"
+    assert (char['strength'], char['max_health']) == (10, 100)
+
+# ============================================================================
+# COLUMNAR CATALOG TESTS
+# ============================================================================
+
+SHOP_ITEMS = [
+    {'item_id': 'small_potion', 'name': 'S', 'type': 'consumable', 'effect': 'health:20', 'cost': 10, 'description': ''},
+    {'item_id': 'big_potion', 'name': 'B', 'type': 'consumable', 'effect': 'health:50', 'cost': 40, 'description': ''},
+    {'item_id': 'elixir', 'name': 'E', 'type': 'consumable', 'effect': 'magic:30', 'cost': 20, 'description': ''},
+    {'item_id': 'iron_sword', 'name': 'I', 'type': 'weapon', 'effect': 'strength:5', 'cost': 50, 'description': ''},
+    {'item_id': 'crown', 'name': 'C', 'type': 'armor', 'effect': 'max_health:100', 'cost': 500, 'description': ''},
+]
+
+def test_item_columns_affordable_filters():
+    """Test affordability masks combined with type and stat filters"""
+    columns = game_data.ItemColumns.from_items(SHOP_ITEMS)
+
+    assert len(columns) == 5
+    assert columns.affordable(40) == ["small_potion", "big_potion", "elixir"]
+    assert columns.affordable(100, item_type="weapon") == ["iron_sword"]
+    assert columns.affordable(100, stat="health") == ["small_potion", "big_potion"]
+    assert columns.affordable(5) == []
+
+def test_item_columns_best_value_ranking():
+    """Test ranking affordable items by effect value per gold"""
+    columns = game_data.ItemColumns.from_items(SHOP_ITEMS)
+    ranked = columns.best_value("consumable", 40)
+
+    assert [item_id for item_id, ratio in ranked] == ["small_potion", "elixir", "big_potion"]
+    assert ranked[0][1] == 2.0
+    assert columns.best_value("consumable", 40, stat="magic", limit=1) == [("elixir", 1.5)]
+
+def test_item_columns_from_file(tmp_path):
+    """Test building columns directly from an item file"""
+    columns = game_data.ItemColumns.from_file(write_file(tmp_path, "items.txt", ITEM_TEXT))
+
+    assert columns.item_ids == ["health_potion", "iron_sword"]
+    assert list(columns.cost) == [25, 50]
+
+# ============================================================================
+# VALIDATION REPORT TESTS
+# ============================================================================
+
+def test_validation_report_for_clean_file(tmp_path):
+    """Test that a good file produces an empty, valid report"""
+    report = game_data.validate_quest_file(write_file(tmp_path, "quests.txt", QUEST_TEXT))
+
+    assert report['valid'] is True
+    assert report['records'] == 2
+    assert report['errors'] == []
+
+def test_validation_report_collects_all_errors(tmp_path):
+    """Test that every bad block is reported with its line number"""
+    text = (
+        QUEST_TEXT.replace("REWARD_GOLD: 25", "REWARD_GOLD: many")
+        .replace("PREREQUISITE: first_steps", "PREREQUISITE: lost_quest")
+        + "\nQUEST_ID: broken\nTITLE Missing colon\n"
+        + "\n" + QUEST_TEXT.split("\n\n")[1]
+    )
+    report = game_data.validate_quest_file(write_file(tmp_path, "quests.txt", text))
+
+    assert report['valid'] is False
+    assert report['records'] == 1
+    assert [(e['line'], e['id']) for e in report['errors']] == [
+        (1, "first_steps"), (9, "goblin_hunter"), (18, "broken"), (20, "goblin_hunter")
+    ]
+    assert "lost_quest" in report['errors'][1]['message']
+    assert "Duplicate" in report['errors'][3]['message']
+
+def test_truncated_validation_report_keeps_earliest_errors(tmp_path):
+    """Test that max_errors keeps the first errors by line, prerequisites included"""
+    text = (
+        QUEST_TEXT.replace("PREREQUISITE: first_steps", "PREREQUISITE: lost_quest")
+        + "\nQUEST_ID: broken\nTITLE Missing colon\n"
+    )
+    report = game_data.validate_quest_file(write_file(tmp_path, "quests.txt", text), max_errors=1)
+
+    assert report['error_count'] == 2
+    assert [(e['line'], e['id']) for e in report['errors']] == [(9, "goblin_hunter")]
+
+def test_validation_resolves_forward_prerequisites(tmp_path):
+    """Test that a prerequisite defined later in the file is accepted"""
+    first, second = QUEST_TEXT.split("\n\n")
+    report = game_data.validate_quest_file(write_file(tmp_path, "quests.txt", second + "\n\n" + first))
+
+    assert report['valid'] is True
+
+def test_validation_report_for_items(tmp_path):
+    """Test that item files are validated too"""
+    text = ITEM_TEXT.replace("TYPE: weapon", "TYPE: trinket")
+    report = game_data.validate_item_file(write_file(tmp_path, "items.txt", text), max_errors=0)
+
+    assert report['error_count'] == 1
+    assert report['errors'] == []
+
+# ============================================================================
+# CATALOG REPOSITORY TESTS
+# ============================================================================
+
+def test_repository_loads_each_file_once(tmp_path, monkeypatch):
+    """Test that repeated gets share one read-only view"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    repository = game_data.CatalogRepository()
+    calls = []
+    real_read = game_data.read_catalog_file
+
+    def counting_read(filename, kind):
+        calls.append(filename)
+        return real_read(filename, kind)
+
+    monkeypatch.setattr(game_data, "read_catalog_file", counting_read)
+    first = repository.get_quests(path)
+    second = repository.get_quests(path)
+
+    assert first is second
+    assert len(calls) == 1
+    with pytest.raises(TypeError):
+        first["new_quest"] = {}
+
+def test_repository_release_and_invalidate(tmp_path):
+    """Test reference counting and explicit invalidation"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    repository = game_data.CatalogRepository()
+
+    view = repository.get_items(path)
+    repository.get_items(path)
+    assert repository.release(path, "item", view) == 1
+    assert repository.get_items(path) is view
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: 30"))
+    repository.invalidate(path)
+    fresh = repository.get_items(path)
+    assert fresh["health_potion"]['cost'] == 30
+    assert view["health_potion"]['cost'] == 25
+
+    # Holders of the old generation can't release the new catalog
+    assert repository.release(path, "item", view) == 1
+    assert repository.release(path, "item", fresh) == 0
+    assert repository.get_items(path) is fresh
+
+def test_repository_keeps_released_catalogs(tmp_path, monkeypatch):
+    """Test that get/release cycles don't re-read the file"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    repository = game_data.CatalogRepository()
+    calls = []
+    real_read = game_data.read_catalog_file
+
+    def counting_read(filename, kind):
+        calls.append(filename)
+        return real_read(filename, kind)
+
+    monkeypatch.setattr(game_data, "read_catalog_file", counting_read)
+    for _ in range(3):
+        view = repository.get_quests(path)
+        assert repository.release(path, "quest", view) == 0
+
+    assert len(calls) == 1
+
+# ============================================================================
+# SHARED MEMORY CATALOG TESTS
+# ============================================================================
+
+def count_available_quests(name, level):
+    """Worker used by the shared catalog test"""
+    import quest_handler
+
+    with game_data.SharedCatalog(name) as quests:
+        char = {'level': level, 'active_quests': [], 'completed_quests': ['first_steps']}
+        return [q['quest_id'] for q in quest_handler.get_available_quests(char, quests)]
+
+def test_shared_catalog_round_trip(tmp_path):
+    """Test publishing a catalog and attaching to it by name"""
+    items = game_data.load_items(write_file(tmp_path, "items.txt", ITEM_TEXT))
+    published = game_data.publish_catalog(items, "item")
+    try:
+        with game_data.SharedCatalog(published.name) as shared:
+            assert shared == items
+            assert list(shared) == list(items)
+            assert shared["iron_sword"].effect_pair == ("strength", 5)
+            assert "missing" not in shared
+    finally:
+        published.unlink()
+
+def test_shared_catalog_in_worker_process(tmp_path):
+    """Test that worker processes read the published catalog"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    quests = game_data.load_quests(write_file(tmp_path, "quests.txt", QUEST_TEXT))
+    published = game_data.publish_catalog(quests, "quest")
+    try:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(count_available_quests, [published.name] * 2, [1, 2]))
+        assert results == [[], ["goblin_hunter"]]
+        assert published["goblin_hunter"]['reward_xp'] == 100
+    finally:
+        published.unlink()
+
+def test_shared_catalog_missing_name():
+    """Test that attaching to an unknown block raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.SharedCatalog("no_such_catalog_block")
+
+# ============================================================================
+# CONTENT PACK TESTS
+# ============================================================================
+
+def write_packs(tmp_path):
+    """Write a plain, a gzip and an xz quest pack into tmp_path/quests"""
+    import gzip
+    import lzma
+
+    first, second = QUEST_TEXT.split("\n\n")
+    third = second.replace("goblin_hunter", "orc_slayer")
+    pack_dir = tmp_path / "quests"
+    pack_dir.mkdir()
+    (pack_dir / "a_core.txt").write_text(first + "\n")
+    with gzip.open(pack_dir / "b_north.txt.gz", "wt") as f:
+        f.write(second)
+    with lzma.open(pack_dir / "c_south.txt.xz", "wt") as f:
+        f.write(third)
+    (pack_dir / "notes.md").write_text("not a pack")
+    return pack_dir
+
+def test_load_quests_from_pack_directory(tmp_path):
+    """Test merging plain and compressed packs from a directory"""
+    pack_dir = write_packs(tmp_path)
+    quests = game_data.load_quests(str(pack_dir))
+
+    assert list(quests) == ["first_steps", "goblin_hunter", "orc_slayer"]
+    assert quests["orc_slayer"]['prerequisite'] == "first_steps"
+
+def test_load_quests_from_glob(tmp_path):
+    """Test that a glob selects only the matching packs"""
+    pack_dir = write_packs(tmp_path)
+    quests = game_data.load_quests(str(pack_dir / "*.txt*"))
+
+    assert set(quests) == {"first_steps", "goblin_hunter", "orc_slayer"}
+    assert set(game_data.load_quests(str(pack_dir / "a_*.txt"))) == {"first_steps"}
+
+def test_duplicate_ids_across_packs(tmp_path):
+    """Test that an id defined in two packs is rejected"""
+    pack_dir = write_packs(tmp_path)
+    (pack_dir / "d_copy.txt").write_text(QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError, match="Duplicate quest_id"):
+        game_data.load_quests(str(pack_dir))
+
+def test_pack_name_with_glob_characters(tmp_path):
+    """Test that packs found in a directory are read by their literal names"""
+    pack_dir = tmp_path / "packs"
+    pack_dir.mkdir()
+    (pack_dir / "eu[1].txt").write_text(QUEST_TEXT)
+
+    assert set(game_data.load_quests(str(pack_dir))) == {"first_steps", "goblin_hunter"}
+    assert set(game_data.load_quests(str(pack_dir / "eu[1].txt"))) == {"first_steps", "goblin_hunter"}
+    assert set(game_data.load_quests_cached(str(pack_dir / "eu[1].txt"))) == {"first_steps", "goblin_hunter"}
+
+def test_empty_pack_glob(tmp_path):
+    """Test that a glob matching nothing raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_items(str(tmp_path / "*.txt"))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])